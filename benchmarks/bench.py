@@ -0,0 +1,381 @@
+"""Flywheel benchmark suite.
+
+Run from the repository root:
+
+    python benchmarks/bench.py                       # full matrix, table on stdout
+    python benchmarks/bench.py --quick -o out.json   # smaller matrix, JSON results
+    python benchmarks/bench.py --compare base.json   # exit 1 on regressions
+
+Every case reports a single number (ns per call, seconds, or bytes); the JSON output is a list of
+{"name", "params", "unit", "value"} entries plus environment metadata so runs can be diffed across versions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload, TypeOverload, scoped_collect, wrap_anycast
+from flywheel.globals import union_scope
+
+CASES: dict[str, Callable[[bool], Iterator[dict[str, Any]]]] = {}
+
+
+def case(func: Callable[[bool], Iterator[dict[str, Any]]]):
+    CASES[func.__name__] = func
+    return func
+
+
+def result(name: str, unit: str, value: float, **params: Any) -> dict[str, Any]:
+    return {"name": name, "params": params, "unit": unit, "value": value}
+
+
+def per_call(func: Callable[[], Any], *, budget: float = 0.2, repeat: int = 5) -> float:
+    """Best-of-`repeat` nanoseconds per call, with the loop count calibrated to roughly `budget` seconds."""
+
+    number = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter_ns() - start
+
+        if elapsed >= budget * 1e9 / repeat or number >= 1 << 22:
+            break
+
+        number *= 4
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter_ns() - start) / number)
+
+    return best
+
+
+def make_endpoint(*overloads: Any) -> FnCollectEndpoint:
+    def target(*values):
+        for overload, value in zip(overloads, values):
+            yield overload.hold(value)
+
+    return FnCollectEndpoint(target)
+
+
+def make_caller(endpoint: FnCollectEndpoint, *overloads: Any) -> Callable[..., Any]:
+    def call(*values):
+        for selection in endpoint.select():
+            for overload, value in zip(overloads, values):
+                if not selection.harvest(overload, value):
+                    break
+            else:
+                selection.complete()
+
+        return selection(*values)  # type: ignore
+
+    return call
+
+
+def populate(context: CollectContext, endpoint: FnCollectEndpoint, size: int, key: Callable[[int], tuple[Any, ...]]):
+    context.collect_many([endpoint(*key(i))(lambda *_, i=i: i) for i in range(size)])
+
+
+def sizes(quick: bool):
+    return (10, 1_000) if quick else (10, 100, 1_000, 10_000, 100_000)
+
+
+@case
+def direct_call(quick: bool):
+    def impl(value):
+        return value
+
+    yield result("direct_call", "ns", per_call(lambda: impl(1)))
+
+
+@case
+def simple_dispatch(quick: bool):
+    for size in sizes(quick):
+        overload = SimpleOverload("key")
+        endpoint = make_endpoint(overload)
+        context = CollectContext()
+        populate(context, endpoint, size, lambda i: (i,))
+
+        call = make_caller(endpoint, overload)
+        compiled = endpoint.dispatch(key=0)
+        with context.lookup_scope():
+            yield result("simple_dispatch", "ns", per_call(lambda: call(size // 2)), implementations=size)
+            yield result("compiled_dispatch", "ns", per_call(lambda: compiled(size // 2)), implementations=size)
+
+
+@case
+def type_dispatch(quick: bool):
+    for size in sizes(quick)[:3]:
+        overload = TypeOverload("type")
+        endpoint = make_endpoint(overload)
+        context = CollectContext()
+        types = [type(f"T{i}", (), {}) for i in range(size)]
+        populate(context, endpoint, size, lambda i: (types[i],))
+
+        call = make_caller(endpoint, overload)
+        value = types[size // 2]()
+        with context.lookup_scope():
+            yield result("type_dispatch", "ns", per_call(lambda: call(value)), implementations=size)
+
+
+@case
+def overload_count(quick: bool):
+    for count in (1, 2, 4) if quick else (1, 2, 4, 8):
+        overloads = [SimpleOverload(f"key{i}") for i in range(count)]
+        endpoint = make_endpoint(*overloads)
+        context = CollectContext()
+        populate(context, endpoint, 100, lambda i: (i,) * count)
+
+        call = make_caller(endpoint, *overloads)
+        values = (50,) * count
+        with context.lookup_scope():
+            yield result("overload_count", "ns", per_call(lambda: call(*values)), overloads=count)
+
+
+@case
+def layout_depth(quick: bool):
+    for depth in (1, 4) if quick else (1, 2, 4, 8, 16):
+        overload = SimpleOverload("key")
+        endpoint = make_endpoint(overload)
+        contexts = [CollectContext() for _ in range(depth)]
+        for index, context in enumerate(contexts):
+            populate(context, endpoint, 10, lambda i, index=index: (i + index * 10,))
+
+        call = make_caller(endpoint, overload)
+        with union_scope(*contexts):
+            # the key lives in the outermost layer, so every layer is probed.
+            yield result("layout_depth", "ns", per_call(lambda: call((depth - 1) * 10)), depth=depth)
+
+
+@case
+def anycast(quick: bool):
+    @wrap_anycast
+    def prototype(value: int) -> int:
+        return value
+
+    yield result("anycast_prototype", "ns", per_call(lambda: prototype(1)))
+
+    context = CollectContext()
+    context.collect(prototype.override(lambda value: value + 1))
+    with context.lookup_scope():
+        yield result("anycast_override", "ns", per_call(lambda: prototype(1)))
+
+        resolved = prototype.resolve()
+        yield result("anycast_resolved", "ns", per_call(lambda: resolved(1)))
+
+
+@case
+def scoped_class(quick: bool):
+    overload = SimpleOverload("key")
+    endpoint = make_endpoint(overload)
+    context = CollectContext()
+
+    with context.collect_scope():
+
+        class impls(m := scoped_collect.locals().target, static=True):
+            @m.impl(endpoint(1))
+            def one(self, value):
+                return value
+
+    call = make_caller(endpoint, overload)
+    with context.lookup_scope():
+        yield result("scoped_class", "ns", per_call(lambda: call(1)))
+
+        impls.bind()
+        yield result("scoped_class_bound", "ns", per_call(lambda: call(1)))
+
+
+@case
+def registration(quick: bool):
+    for size in sizes(quick)[:4]:
+        for mode in ("collect", "collect_many"):
+            overload = SimpleOverload("key")
+            endpoint = make_endpoint(overload)
+            context = CollectContext()
+            entities = [endpoint(i)(lambda *_, i=i: i) for i in range(size)]
+
+            start = time.perf_counter()
+            if mode == "collect":
+                for entity in entities:
+                    context.collect(entity)
+            else:
+                context.collect_many(entities)
+
+            yield result("registration", "s", time.perf_counter() - start, implementations=size, mode=mode)
+
+
+@case
+def peak_memory(quick: bool):
+    for size in sizes(quick)[:4]:
+        overload = SimpleOverload("key")
+        endpoint = make_endpoint(overload)
+        implements = [lambda *_, i=i: i for i in range(size)]
+        gc.collect()
+
+        # the implementations themselves are allocated up front, so only the registry is measured.
+        tracemalloc.start()
+        context = CollectContext()
+        context.collect_many([endpoint(i)(implement) for i, implement in enumerate(implements)])
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        yield result("registry_memory", "bytes", current, implementations=size)
+        yield result("registry_bytes_per_implementation", "bytes", current / size, implementations=size)
+        yield result("registry_peak_memory", "bytes", peak, implementations=size)
+
+
+@case
+def churn_memory(quick: bool):
+    overload = SimpleOverload("key")
+    endpoint = make_endpoint(overload)
+    context = CollectContext()
+    populate(context, endpoint, 100, lambda i: (i,))
+
+    cycles = 5_000 if quick else 50_000
+    for i in range(cycles):
+        entity = endpoint(100 + i)(lambda *_, i=i: i)
+        context.collect(entity)
+        context.discard(entity)
+
+    implements = [lambda *_, i=i: i for i in range(1_000)]
+    gc.collect()
+
+    tracemalloc.start()
+    context.collect_many([endpoint(-1 - i)(implement) for i, implement in enumerate(implements)])
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    yield result("churn_bytes_per_implementation", "bytes", current / len(implements), cycles=cycles)
+
+
+@case
+def dispatch_memory(quick: bool):
+    overload = SimpleOverload("key")
+    endpoint = make_endpoint(overload)
+    context = CollectContext()
+    populate(context, endpoint, 100, lambda i: (i,))
+
+    call = make_caller(endpoint, overload)
+    compiled = endpoint.dispatch(key=0)
+    rounds = 1_000
+
+    with context.lookup_scope():
+        for name, func in (("simple", call), ("compiled", compiled)):
+            func(50)
+            gc.collect()
+
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            func(50)
+            peak = tracemalloc.get_traced_memory()[1]
+
+            for _ in range(rounds):
+                func(50)
+            retained = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            yield result("dispatch_peak_bytes", "bytes", peak - before, mode=name)
+            yield result("dispatch_retained_bytes", "bytes", (retained - before) / rounds, mode=name)
+
+
+@case
+def import_time(quick: bool):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [sys.path[0], os.environ.get("PYTHONPATH")]))}
+
+    def measure(code: str) -> float:
+        best = float("inf")
+        for _ in range(3 if quick else 7):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], env=env, check=True)
+            best = min(best, time.perf_counter() - start)
+
+        return best
+
+    yield result("import_time", "s", measure("import flywheel") - measure("pass"))
+
+
+def environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "commit": commit,
+        "timestamp": time.time(),
+    }
+
+
+def identity(entry: dict[str, Any]) -> str:
+    params = ",".join(f"{key}={value}" for key, value in sorted(entry["params"].items()))
+    return f"{entry['name']}[{params}]" if params else entry["name"]
+
+
+def compare(results: list[dict[str, Any]], baseline_path: str, threshold: float) -> int:
+    with open(baseline_path) as f:
+        baseline = {identity(entry): entry for entry in json.load(f)["results"]}
+
+    regressions = 0
+    for entry in results:
+        base = baseline.get(identity(entry))
+        if base is None or not base["value"]:
+            continue
+
+        ratio = entry["value"] / base["value"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+
+        print(f"{identity(entry):<60} {base['value']:>14.6g} -> {entry['value']:>14.6g} {entry['unit']:<5} x{ratio:.2f}{flag}")
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--quick", action="store_true", help="run a reduced parameter matrix")
+    parser.add_argument("-o", "--output", help="write JSON results to this path")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a previous JSON result")
+    parser.add_argument("--threshold", type=float, default=1.25, help="ratio above which --compare reports a regression")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.cases or CASES:
+        for entry in CASES[name](args.quick):
+            results.append(entry)
+            if not args.compare:
+                print(f"{identity(entry):<60} {entry['value']:>14.6g} {entry['unit']}", flush=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
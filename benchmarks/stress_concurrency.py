@@ -0,0 +1,212 @@
+"""Concurrent registration stress test.
+
+Run from the repository root:
+
+    python benchmarks/stress_concurrency.py                   # 4 writers, 4 readers, 3 seconds
+    python benchmarks/stress_concurrency.py --writers 8 --seconds 10
+
+Writer threads keep collecting (and discarding) implementations into a shared context while reader threads
+dispatch against it. Every implementation returns the key it was registered under, so a reader that gets back
+a different key has observed a half-laid registration. A separate writer keeps creating fresh layers and gives
+each its first record while readers look through them, so a lookup plan cached around that moment must not hide
+the record once it is published. Exits 1 on any such violation or unexpected exception.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload
+from flywheel.globals import union_scope
+
+STABLE = 100
+LAYERS = 16
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--discard-every", type=int, default=2, help="discard every Nth collected implementation")
+    args = parser.parse_args(argv)
+
+    overload = SimpleOverload("key")
+
+    def target(key: int):
+        yield overload.hold(key)
+
+    endpoint = FnCollectEndpoint(target)
+    context = CollectContext()
+
+    # keys below STABLE are registered up front and must always resolve.
+    context.collect_many([endpoint(key)(lambda key=key: key) for key in range(STABLE)])
+
+    def call(key: int):
+        for selection in endpoint.select():
+            if not selection.harvest(overload, key):
+                continue
+
+            selection.complete()
+
+        return selection()  # type: ignore
+
+    compiled = endpoint.dispatch(key=0)
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    counts: dict[str, int] = {"collected": 0, "discarded": 0, "layers": 0, "calls": 0, "misses": 0}
+    violations: list[str] = []
+    # the key each writer registered last, so readers chase implementations that are still being laid.
+    latest = [STABLE + index for index in range(args.writers)]
+    # fresh layers and, per layer, whether its first record has been published; replaced wholesale every round.
+    fresh: list[tuple[tuple[CollectContext, ...], list[bool]]] = [((), [])]
+
+    def report(message: str):
+        with lock:
+            violations.append(message)
+
+    def writer(index: int):
+        key = STABLE + index
+        collected = discarded = 0
+
+        while not stop.is_set():
+            entity = endpoint(key)(lambda key=key: key)
+            latest[index] = key
+            if collected % 2:
+                context.collect(entity)
+            else:
+                context.collect_many([entity])
+
+            collected += 1
+            if collected % args.discard_every == 0:
+                context.discard(entity)
+                discarded += 1
+
+            key += args.writers
+
+        with lock:
+            counts["collected"] += collected
+            counts["discarded"] += discarded
+
+    def layer_writer():
+        rounds = 0
+
+        while not stop.is_set():
+            layers = tuple(CollectContext() for _ in range(LAYERS))
+            ready = [False] * LAYERS
+            fresh[0] = (layers, ready)
+
+            for position, layer in enumerate(layers):
+                key = -1 - position
+                layer.collect(endpoint(key)(lambda key=key: key))
+                ready[position] = True
+                time.sleep(0)
+
+            rounds += 1
+
+        with lock:
+            counts["layers"] = rounds * LAYERS
+
+    def layered(index: int, step: int) -> tuple[int, int]:
+        layers, ready = fresh[0]
+        if not layers:
+            return 0, 0
+
+        position = step % LAYERS
+        key = -1 - position
+        published = ready[position]
+
+        # many distinct layouts around the same layer, so plans keep being built while records appear.
+        start = step % (position + 1)
+        end = position + 1 + step // LAYERS % (LAYERS - position)
+
+        with union_scope(*layers[start:end]):
+            try:
+                value = compiled(key) if index % 2 else call(key)
+            except NotImplementedError:
+                if published:
+                    report(f"reader {index}: first record of fresh layer {position} missed after it was published")
+
+                return 1, 1
+
+        if value != key:
+            report(f"reader {index}: fresh key {key} dispatched to implementation of {value}")
+
+        return 1, 0
+
+    def reader(index: int):
+        calls = misses = 0
+        step = 0
+
+        with context.lookup_scope():
+            while not stop.is_set():
+                step += 1
+                if step % 2 == 0:
+                    called, missed = layered(index, step // 2)
+                    calls += called
+                    misses += missed
+                    continue
+
+                key = step % STABLE if step % 2 else latest[step % args.writers] - args.writers * (step % 3)
+
+                try:
+                    value = compiled(key) if index % 2 else call(key)
+                except NotImplementedError:
+                    if key < STABLE:
+                        report(f"reader {index}: stable key {key} missed")
+
+                    misses += 1
+                else:
+                    if value != key:
+                        report(f"reader {index}: key {key} dispatched to implementation of {value}")
+
+                calls += 1
+
+        with lock:
+            counts["calls"] += calls
+            counts["misses"] += misses
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    threads += [threading.Thread(target=layer_writer)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+
+    # any other exception ends its thread and is reported here, so every thread fails the run the same way.
+    def excepthook(hook: threading.ExceptHookArgs):
+        report(f"{hook.thread.name if hook.thread else '?'}: {hook.exc_type.__name__}: {hook.exc_value}")
+
+    previous = sys.getswitchinterval()
+    previous_hook = threading.excepthook
+    sys.setswitchinterval(1e-6)
+    threading.excepthook = excepthook
+    try:
+        for thread in threads:
+            thread.start()
+
+        time.sleep(args.seconds)
+        stop.set()
+
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(previous)
+        threading.excepthook = previous_hook
+
+    summary: dict[str, Any] = {**counts, "violations": len(violations)}
+    print(" ".join(f"{name}={value}" for name, value in summary.items()))
+
+    for message in violations[:20]:
+        print(message, file=sys.stderr)
+
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,25 @@
 from .context import CollectContext as CollectContext
 from .context import InstanceContext as InstanceContext
+from .fn import BatchSelection as BatchSelection
 from .fn import FnCollectEndpoint as FnCollectEndpoint
 from .fn import FnImplementEntity as FnImplementEntity
 from .fn import FnOverload as FnOverload
 from .fn import FnRecord as FnRecord
+from .fn import HarvestCache as HarvestCache
+from .fn import batched as batched
 from .fn import wrap_endpoint as wrap_endpoint
 from .fn import wrap_entity as wrap_entity
 from .globals import global_collect as global_collect
 from .globals import local_collect as local_collect
 from .instance_of import InstanceOf as InstanceOf
 from .overloads import SINGLETON_OVERLOAD as SINGLETON_OVERLOAD
+from .overloads import PathOverload as PathOverload
+from .overloads import PrefixOverload as PrefixOverload
+from .overloads import RangeOverload as RangeOverload
 from .overloads import SimpleOverload as SimpleOverload
 from .overloads import SingletonOverload as SingletonOverload
 from .overloads import TypeOverload as TypeOverload
 from .scoped import scoped_collect as scoped_collect
+from .tracing import trace as trace
 from .userspace import Anycast as Anycast
 from .userspace import wrap_anycast as wrap_anycast
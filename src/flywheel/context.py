@@ -1,24 +1,213 @@
 from __future__ import annotations
 
-from collections import ChainMap
+import asyncio
+import itertools
+import threading
+import weakref
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Any, Mapping, MutableMapping
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Iterable, Mapping, MutableMapping
 
 from .typing import TEntity, cvar
 
 if TYPE_CHECKING:
+    from .fn.endpoint import PlanStamp
+    from .fn.implement import WeakImplement
+    from .fn.overload import FnOverload
     from .fn.record import FnRecord, FnRecordLabel
+    from .snapshot import LazyImplement
+
+
+class WriterLock:
+    __slots__ = ("_lock", "depth", "deferred")
+
+    depth: int
+    deferred: list[Callable[[], Any]]
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self.depth = 0
+        self.deferred = []
+
+    def defer(self, callback: Callable[[], Any]):
+        self.deferred.append(callback)
+
+    def __enter__(self):
+        self._lock.acquire()
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            # deferred work waits for the outermost writer, so no caller up the stack still holds a record it is laying into.
+            if self.depth == 1:
+                while self.deferred:
+                    self.deferred.pop(0)()
+        finally:
+            self.depth -= 1
+            self._lock.release()
 
 
 class CollectContext:
     fn_implements: dict[FnRecordLabel, FnRecord]
+    plans: dict[PlanStamp, dict[tuple[CollectContext, ...], tuple[int, tuple[tuple[int, FnRecord], ...]]]]
+    proxies: weakref.WeakKeyDictionary[Callable, WeakImplement]
+    restored: dict[str, LazyImplement]
+    lock: WriterLock
 
-    def __init__(self):
+    frozen: bool = False
+    weak: bool = False
+
+    clock: ClassVar[int] = 0
+
+    def __init__(self, *, weak: bool = False):
         self.fn_implements = {}
+        self.plans = {}
+        self.weak = weak
+        self.proxies = weakref.WeakKeyDictionary()
+        self.restored = {}
+        # serialises writers only; dispatch never takes it.
+        self.lock = WriterLock()
+
+    def touch(self):
+        CollectContext.clock += 1
+
+    def freeze(self):
+        with self.lock:
+            for label, record in self.fn_implements.items():
+                record.freeze(label.endpoint)
+
+            self.frozen = True
+
+        return self
 
     def collect(self, entity: TEntity) -> TEntity:
         return entity.collect(self)
 
+    def slot_of(self, implement: Callable) -> Callable:
+        # the key records hold an implementation under: its weak proxy, the snapshot entry it took over, or itself.
+        try:
+            proxy = self.proxies.get(implement)
+        except TypeError:
+            proxy = None
+
+        if proxy is not None:
+            return proxy
+
+        if self.restored:
+            target = getattr(implement, "__func__", implement)
+            lazy = self.restored.get(f"{getattr(target, '__module__', None)}:{getattr(target, '__qualname__', None)}")
+            if lazy is not None:
+                return lazy
+
+        return implement
+
+    def implement_of(self, implement: Callable) -> Callable:
+        from .fn.implement import WeakImplement
+
+        slot = self.slot_of(implement)
+        if slot is not implement:
+            # a snapshot entry is collected again once its module is imported: point it at the function and reuse the slot.
+            if not isinstance(slot, WeakImplement):
+                slot.target = implement  # type: ignore
+
+            return slot
+
+        if not self.weak:
+            return implement
+
+        try:
+            proxy = self.proxies[implement] = WeakImplement(implement, self._expire)
+        except TypeError:
+            return implement
+
+        return proxy
+
+    def _expire(self, proxy: WeakImplement):
+        with self.lock:
+            if not self.frozen:
+                for label in list(self.fn_implements):
+                    self._discard(label, proxy)
+
+                self.touch()
+
+    def _discard(self, label: FnRecordLabel, implement: Callable) -> bool:
+        record = self.fn_implements.get(label)
+        if record is None or not record.discard(implement):
+            return False
+
+        if record.sparse:
+            self.lock.defer(lambda: self._compact(label))
+
+        return True
+
+    def _compact(self, label: FnRecordLabel):
+        from .globals import invalidate_plans
+
+        record = self.fn_implements.get(label)
+        if record is not None and record.sparse and not self.frozen:
+            self.fn_implements[label] = record.compact()
+            invalidate_plans(label.endpoint)
+
+    def discard(self, entity: Any) -> bool:
+        from .fn.implement import FnImplementEntity
+
+        if self.frozen:
+            raise RuntimeError(f"cannot discard from a frozen {self.__class__.__name__}")
+
+        removed = False
+        with self.lock:
+            if isinstance(entity, FnImplementEntity):
+                implement = self.slot_of(entity.impl)
+                labels = [endpoint.signature for endpoint, _ in entity.targets]
+            else:
+                implement = self.slot_of(entity)
+                labels = list(self.fn_implements)
+
+            for label in labels:
+                removed = self._discard(label, implement) or removed
+
+            if removed:
+                self.touch()
+
+        return removed
+
+    def collect_many(self, entities: Iterable[TEntity]) -> list[TEntity]:
+        from .fn.implement import FnImplementEntity
+
+        collected = []
+        batches: dict[tuple[FnRecord, FnOverload], list[tuple[Any, Any]]] = {}
+        published: list[tuple[FnRecord, Callable]] = []
+
+        with self.lock:
+            for entity in entities:
+                if isinstance(entity, FnImplementEntity):
+                    implement = self.implement_of(entity.impl)
+
+                    for record, signals in entity.resolve_targets(self):
+                        published.append((record, implement))
+
+                        for signal in signals:
+                            key = (record, signal.overload)
+
+                            if key in batches:
+                                batches[key].append((signal.value, implement))
+                            else:
+                                batches[key] = [(signal.value, implement)]
+                else:
+                    entity.collect(self)
+
+                collected.append(entity)
+
+            for (record, overload), items in batches.items():
+                overload.lay_many(record, items)
+
+            for record, implement in published:
+                record.publish(implement)
+
+            self.touch()
+
+        return collected
+
     @contextmanager
     def collect_scope(self):
         from .globals import COLLECTING_CONTEXT_VAR
@@ -39,18 +228,264 @@ class CollectContext:
             yield self
 
 
+INSTANCE_GENERATIONS = itertools.count(1)
+
+
+class InstanceLayer(dict):
+    __slots__ = ("owner",)
+
+    owner: InstanceContext | None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.owner = None
+
+    def _changed(self):
+        if self.owner is not None:
+            self.owner.invalidate()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
+class InstanceView(MutableMapping[type, Any]):
+    # reads see the merged view including providers; writes, like ChainMap, only touch the context's own layer.
+    __slots__ = ("context",)
+
+    context: InstanceContext
+
+    def __init__(self, context: InstanceContext):
+        self.context = context
+
+    def __getitem__(self, target: type) -> Any:
+        return self.context.lookup(target)
+
+    def __setitem__(self, target: type, value: Any):
+        self.context.layer[target] = value
+
+    def __delitem__(self, target: type):
+        del self.context.layer[target]
+
+    def __contains__(self, target: object) -> bool:
+        return target in self.context.resolve() or target in self.context.resolved_providers
+
+    def __iter__(self):
+        resolved = self.context.resolve()
+        yield from resolved
+        yield from (target for target in self.context.resolved_providers if target not in resolved)
+
+    def __len__(self) -> int:
+        resolved = self.context.resolve()
+        return len(resolved) + sum(target not in resolved for target in self.context.resolved_providers)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.context.resolve())!r})"
+
+
+PROVIDER_LIFETIMES = ("singleton", "scope", "task")
+
+
+def _task_key() -> Any:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+
+    return task if task is not None else threading.current_thread()
+
+
+class InstanceProvider:
+    target: type
+    factory: Callable[[], Any]
+    lifetime: str
+    owner: InstanceContext
+    builds: int
+    building: bool
+    tasks: weakref.WeakKeyDictionary[Any, Any]
+
+    def __init__(self, target: type, factory: Callable[[], Any], lifetime: str, owner: InstanceContext):
+        if lifetime not in PROVIDER_LIFETIMES:
+            raise ValueError(f"unknown lifetime {lifetime!r}, expected one of {PROVIDER_LIFETIMES}")
+
+        self.target = target
+        self.factory = factory
+        self.lifetime = lifetime
+        self.owner = owner
+        self.builds = 0
+        self.building = False
+        self.tasks = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()
+
+    def _build(self) -> Any:
+        if self.building:
+            raise RuntimeError(f"circular provider dependency while building {self.target!r}")
+
+        self.building = True
+        try:
+            instance = self.factory()
+        finally:
+            self.building = False
+
+        self.builds += 1
+        return instance
+
+    def get(self, context: InstanceContext) -> Any:
+        with self._lock:
+            if self.lifetime == "task":
+                key = _task_key()
+                if key not in self.tasks:
+                    self.tasks[key] = self._build()
+
+                return self.tasks[key]
+
+            if self.lifetime == "scope":
+                # kept off the layers, which every scope built on this context would inherit.
+                built = context.scoped
+                if self not in built:
+                    built[self] = self._build()
+
+                return built[self]
+
+            # built singletons are stored into a layer so later lookups hit the resolved cache directly.
+            layer = self.owner.layer
+            if self.target not in layer:
+                layer[self.target] = self._build()
+
+            return layer[self.target]
+
+
 class InstanceContext:
-    instances: MutableMapping[type, Any]
+    layer: InstanceLayer
+    providers: dict[type, InstanceProvider]
+    scoped: dict[InstanceProvider, Any]
+    children: weakref.WeakSet[InstanceContext]
+    generation: int
+    resolved: dict[type, Any]
+    resolved_providers: dict[type, InstanceProvider]
+    resolved_at: int
 
     def __init__(self):
-        self.instances = {}
+        self.children = weakref.WeakSet()
+        self.generation = next(INSTANCE_GENERATIONS)
+        self.providers = {}
+        self.scoped = {}
+        self._bases = ()
+        self.resolved = {}
+        self.resolved_providers = {}
+        self.resolved_at = -1
+        self.instances = InstanceLayer()
+
+    @property
+    def instances(self) -> MutableMapping[type, Any]:
+        return InstanceView(self)
+
+    @instances.setter
+    def instances(self, value: Mapping[type, Any]):
+        layer = value if isinstance(value, InstanceLayer) and value.owner is None else InstanceLayer(value)
+        layer.owner = self
+        self.layer = layer
+        self.invalidate()
+
+    @property
+    def bases(self) -> tuple[InstanceContext, ...]:
+        return self._bases
+
+    @bases.setter
+    def bases(self, value: tuple[InstanceContext, ...]):
+        for base in value:
+            base.children.add(self)
+
+        self._bases = value
+        self.invalidate()
+
+    def invalidate(self):
+        # only this context and the scopes built on top of it go stale; unrelated contexts keep their caches.
+        self.generation = next(INSTANCE_GENERATIONS)
+
+        for child in list(self.children):
+            child.invalidate()
+
+    def resolve(self) -> dict[type, Any]:
+        generation = self.generation
+        if self.resolved_at == generation:
+            return self.resolved
+
+        resolved: dict[type, Any] = {}
+        providers: dict[type, InstanceProvider] = {}
+
+        def merge(instances: Mapping[type, Any], layer_providers: Mapping[type, InstanceProvider]):
+            for target in layer_providers:
+                resolved.pop(target, None)
+
+            providers.update(layer_providers)
+
+            for target in instances:
+                providers.pop(target, None)
+
+            resolved.update(instances)
+
+        # each base answers from its own cache, so a rebuild only merges one flattened view per base.
+        for base in reversed(self._bases):
+            merge(base.resolve(), base.resolved_providers)
+
+        merge(self.layer, self.providers)
+        self.resolved = resolved
+        self.resolved_providers = providers
+        self.resolved_at = generation
+        return resolved
+
+    def lookup(self, target: type) -> Any:
+        resolved = self.resolve()
+        if target in resolved:
+            return resolved[target]
+
+        if target in self.resolved_providers:
+            return self.resolved_providers[target].get(self)
+
+        raise KeyError(target)
 
     def store(self, *collection_or_target: Mapping[type, Any] | Any):
         for item in collection_or_target:
             if isinstance(item, Mapping):
-                self.instances.update(item)
+                self.layer.update(item)
             else:
-                self.instances[item.__class__] = item
+                self.layer[item.__class__] = item
+
+    def provide(self, target: type, factory: Callable[[], Any] | None = None, *, lifetime: str = "singleton") -> InstanceProvider:
+        provider = self.providers[target] = InstanceProvider(target, factory or target, lifetime, self)
+        self.invalidate()
+        return provider
+
+    def unused_providers(self) -> list[InstanceProvider]:
+        return [provider for provider in self.providers.values() if not provider.builds]
 
     @contextmanager
     def scope(self, *, inherit: bool = True):
@@ -58,7 +493,7 @@ class InstanceContext:
 
         if inherit:
             res = InstanceContext()
-            res.instances = ChainMap({}, self.instances, INSTANCE_CONTEXT_VAR.get().instances)
+            res.bases = (self, INSTANCE_CONTEXT_VAR.get())
 
             with res.scope(inherit=False):
                 yield self
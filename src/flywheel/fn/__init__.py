@@ -1,3 +1,6 @@
+from .batch import BatchSelection as BatchSelection
+from .batch import batched as batched
+from .cache import HarvestCache as HarvestCache
 from .endpoint import FnCollectEndpoint as FnCollectEndpoint
 from .endpoint import wrap_endpoint as wrap_endpoint
 from .implement import FnImplementEntity as FnImplementEntity
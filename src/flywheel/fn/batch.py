@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Generic, Hashable, Iterator, Sequence
+
+from ..typing import C, T
+
+if TYPE_CHECKING:
+    from .cache import HarvestCache
+    from .endpoint import FnCollectEndpoint
+    from .overload import FnOverload
+
+
+def batched(func: T) -> T:
+    func.__flywheel_batched__ = True  # type: ignore
+    return func
+
+
+def is_batched(func: Callable) -> bool:
+    return getattr(func, "__flywheel_batched__", False)
+
+
+class BatchSelection(Generic[C]):
+    endpoint: FnCollectEndpoint[..., C]
+    values: Sequence[Any]
+    groups: dict[C, Any]
+    missing: list[Any]
+
+    def __init__(self, endpoint: FnCollectEndpoint[..., C], values: Sequence[Any]):
+        self.endpoint = endpoint
+        self.values = values
+        self.groups = {}
+        self.missing = []
+
+    @classmethod
+    def build(
+        cls, endpoint: FnCollectEndpoint[..., C], overload: FnOverload, values: Sequence[Any], cache: HarvestCache | None = None
+    ) -> BatchSelection[C]:
+        batch = cls(endpoint, values)
+        numpy = sys.modules.get("numpy")
+
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            uniques, inverse = numpy.unique(values, return_inverse=True)
+            order = numpy.argsort(inverse.ravel(), kind="stable")
+            splits = numpy.split(order, numpy.cumsum(numpy.bincount(inverse.ravel(), minlength=len(uniques)))[:-1])
+
+            # harvest numpy scalars rather than .tolist() ones, so type-keyed overloads see np.int64 and not int.
+            chunks: dict[Hashable, tuple[Any, list[Any]]] = {}
+            for value, indices in zip(uniques, splits):
+                key = overload.cache_key(value)
+                if key in chunks:
+                    chunks[key][1].append(indices)
+                else:
+                    chunks[key] = (value, [indices])
+
+            distinct = [(value, batch.concat(parts)) for value, parts in chunks.values()]
+        else:
+            positions: dict[Hashable, tuple[Any, list[int]]] = {}
+            for index, value in enumerate(values):
+                key = overload.cache_key(value)
+                if key in positions:
+                    positions[key][1].append(index)
+                else:
+                    positions[key] = (value, [index])
+
+            distinct = positions.values()
+
+        resolved: dict[C, list[Any]] = {}
+        for value, indices in distinct:
+            implement = batch.resolve(overload, value, cache)
+
+            if implement is None:
+                batch.missing.append(indices)
+            elif implement in resolved:
+                resolved[implement].append(indices)
+            else:
+                resolved[implement] = [indices]
+
+        for implement, chunks in resolved.items():
+            batch.groups[implement] = batch.concat(chunks)
+
+        if batch.missing:
+            batch.missing = [batch.concat(batch.missing)]
+
+        return batch
+
+    def resolve(self, overload: FnOverload, value: Any, cache: HarvestCache | None = None) -> C | None:
+        for selection in self.endpoint.select(False, cache=cache):
+            if not selection.harvest(overload, value):
+                continue
+
+            selection.complete()
+
+            for implement in selection:
+                return implement
+
+        return None
+
+    def concat(self, chunks: list[Any]):
+        numpy = sys.modules.get("numpy")
+
+        if numpy is not None and isinstance(self.values, numpy.ndarray):
+            return numpy.sort(numpy.concatenate(chunks)) if len(chunks) > 1 else chunks[0]
+
+        if len(chunks) == 1:
+            return chunks[0]
+
+        return sorted(index for chunk in chunks for index in chunk)
+
+    def take(self, indices: Any) -> Sequence[Any]:
+        numpy = sys.modules.get("numpy")
+
+        if numpy is not None and isinstance(self.values, numpy.ndarray):
+            return self.values.ravel()[indices]
+
+        return [self.values[index] for index in indices]
+
+    def __iter__(self) -> Iterator[tuple[C, Sequence[Any]]]:
+        for implement, indices in self.groups.items():
+            yield implement, self.take(indices)
+
+    def __len__(self):
+        return len(self.groups)
+
+    def __bool__(self):
+        return bool(self.groups)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        if self.missing:
+            raise NotImplementedError("cannot lookup any implementation with given arguments")
+
+        numpy = sys.modules.get("numpy")
+        if numpy is not None and isinstance(self.values, numpy.ndarray):
+            results = numpy.empty(self.values.size, dtype=object)
+        else:
+            results = [None] * len(self.values)
+
+        for implement, indices in self.groups.items():
+            items = self.take(indices)
+
+            if is_batched(implement):
+                outputs = implement(items, *args, **kwargs)
+
+                if isinstance(results, list):
+                    for index, output in zip(indices, outputs):
+                        results[index] = output
+                else:
+                    results[indices] = outputs
+            else:
+                for index, item in zip(indices, items):
+                    results[index] = implement(item, *args, **kwargs)
+
+        if not isinstance(results, list):
+            return results.reshape(self.values.shape)
+
+        return results
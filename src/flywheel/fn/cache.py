@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Hashable, Mapping, NamedTuple, Tuple
+
+if TYPE_CHECKING:
+    from .overload import FnOverload
+    from .record import FnRecord
+
+HarvestKey = Tuple[Tuple["FnOverload", Hashable], ...]
+
+
+class HarvestCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class HarvestCache:
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    entries: OrderedDict[tuple[FnRecord, HarvestKey], tuple[int, Mapping[Callable, None], int]]
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def lookup(self, record: FnRecord, key: HarvestKey) -> tuple[Mapping[Callable, None], int] | None:
+        entry = self.entries.get((record, key))
+
+        if entry is None or entry[0] != record.version:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end((record, key))
+        return entry[1], entry[2]
+
+    def store(self, record: FnRecord, key: HarvestKey, digs: Mapping[Callable, None], mask: int):
+        entries = self.entries
+        entries[(record, key)] = (record.version, digs, mask)
+        entries.move_to_end((record, key))
+
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def info(self) -> HarvestCacheInfo:
+        return HarvestCacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.entries))
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __repr__(self) -> str:
+        return f"<HarvestCache {self.info()}>"
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Callable, Tuple, Union
+
+from ..globals import caller_index, lookup_plan
+from ..lazy import LAZY_GROUPS, LAZY_PROVIDERS, load_providers
+from ..probes import PROBES, observe_call, observe_miss
+from .selection import wrap_implement
+
+if TYPE_CHECKING:
+    from .endpoint import FnCollectEndpoint
+    from .record import FnRecord
+
+ArgumentSource = Union[int, Callable[..., Any]]
+Routes = Tuple[Tuple[str, Callable[..., Any]], ...]
+
+
+def _getter(source: ArgumentSource) -> Callable[..., Any]:
+    if isinstance(source, int):
+        position = source
+        return lambda *args, **kwargs: args[position]
+
+    return source
+
+
+def _invoke(endpoint: FnCollectEndpoint, record: FnRecord, mask: int, args: tuple, kwargs: dict[str, Any]):
+    raw = record.first(mask)
+    wrapper = record.wrappers.get(raw)
+    if wrapper is None:
+        wrapper = record.wrappers[raw] = wrap_implement(endpoint, raw)
+
+    if PROBES:
+        return observe_call(endpoint, raw, wrapper, args, kwargs)
+
+    return wrapper(*args, **kwargs)
+
+
+def _miss(endpoint: FnCollectEndpoint):
+    if PROBES:
+        observe_miss(endpoint)
+
+    return NotImplementedError("cannot lookup any implementation with given arguments")
+
+
+def _fallback(endpoint: FnCollectEndpoint, default: Callable | None, args: tuple, kwargs: dict[str, Any]):
+    # every miss ends here, whether no layer matched or a layer settled the lookup with nothing to call.
+    if default is not None:
+        return default(*args, **kwargs)
+
+    raise _miss(endpoint)
+
+
+def _observe_layer(endpoint: FnCollectEndpoint, record: FnRecord, layer_index: int, routes: Routes, values: list[Any]) -> int | None:
+    # None moves on to the next layer, 0 is a definite miss; same outcomes as the compiled loops below.
+    scopes = record.scopes
+    overloads = record.overloads
+    pending = record.pending
+    mask = None
+
+    for (name, _), value in zip(routes, values):
+        if name not in scopes:
+            return None if pending else 0
+
+        start = perf_counter_ns()
+        digs = overloads[name].harvest(scopes[name], value)
+        visible = record.mask_of(digs) & ~pending if digs else 0
+        mask = visible if mask is None else mask & visible
+
+        end = perf_counter_ns()
+        for probe in PROBES:
+            probe.harvest(endpoint, overloads[name], layer_index, not mask, start, end)
+
+        if not visible:
+            return None
+
+    return mask
+
+
+def _observe(
+    endpoint: FnCollectEndpoint,
+    routes: Routes,
+    default: Callable | None,
+    dispatcher: Callable[..., Any],
+    args: tuple,
+    kwargs: dict[str, Any],
+):
+    # the probed twin of the compiled loops, reporting the lookup, layer and harvest events select() does.
+    values = [getter(*args, **kwargs) for _, getter in routes]
+    index = caller_index(endpoint)
+    start = perf_counter_ns()
+    layers = 0
+    mask = None
+
+    for layer_index, record in lookup_plan(endpoint):
+        if layer_index <= index:
+            continue
+
+        layers += 1
+        hop = perf_counter_ns()
+        mask = _observe_layer(endpoint, record, layer_index, routes, values)
+
+        end = perf_counter_ns()
+        for probe in PROBES:
+            probe.layer(endpoint, layer_index, hop, end)
+
+        if mask is not None:
+            break
+
+    end = perf_counter_ns()
+    for probe in PROBES:
+        probe.lookup(endpoint, layers, bool(mask), start, end)
+
+    if mask:
+        return _invoke(endpoint, record, mask, args, kwargs)
+
+    if mask is None and (LAZY_PROVIDERS or LAZY_GROUPS) and load_providers(endpoint):
+        return dispatcher(*args, **kwargs)
+
+    return _fallback(endpoint, default, args, kwargs)
+
+
+def _compile_single(endpoint: FnCollectEndpoint, name: str, getter: Callable[..., Any], default: Callable | None):
+    routes = ((name, getter),)
+
+    def dispatcher(*args, **kwargs):
+        if PROBES:
+            return _observe(endpoint, routes, default, dispatcher, args, kwargs)
+
+        value = getter(*args, **kwargs)
+        index = caller_index(endpoint)
+
+        for layer_index, record in lookup_plan(endpoint):
+            if layer_index <= index:
+                continue
+
+            scopes = record.scopes
+            if name not in scopes:
+                if record.pending:
+                    continue
+
+                return _fallback(endpoint, default, args, kwargs)
+
+            digs = record.overloads[name].harvest(scopes[name], value)
+            if digs:
+                mask = record.mask_of(digs)
+
+                pending = record.pending
+                if pending:
+                    mask &= ~pending
+                    if not mask:
+                        continue
+
+                if not mask:
+                    return _fallback(endpoint, default, args, kwargs)
+
+                return _invoke(endpoint, record, mask, args, kwargs)
+
+        if (LAZY_PROVIDERS or LAZY_GROUPS) and load_providers(endpoint):
+            return dispatcher(*args, **kwargs)
+
+        return _fallback(endpoint, default, args, kwargs)
+
+    return dispatcher
+
+
+def compile_dispatch(endpoint: FnCollectEndpoint, sources: dict[str, ArgumentSource], default: Callable | None = None):
+    routes = tuple((name, _getter(source)) for name, source in sources.items())
+
+    if len(routes) == 1:
+        dispatcher = _compile_single(endpoint, *routes[0], default)
+        dispatcher.__wrapped__ = endpoint.target  # type: ignore
+        return dispatcher
+
+    def dispatcher(*args, **kwargs):
+        if PROBES:
+            return _observe(endpoint, routes, default, dispatcher, args, kwargs)
+
+        values = [getter(*args, **kwargs) for _, getter in routes]
+        index = caller_index(endpoint)
+
+        for layer_index, record in lookup_plan(endpoint):
+            if layer_index <= index:
+                continue
+
+            scopes = record.scopes
+            overloads = record.overloads
+            mask = None
+
+            pending = record.pending
+
+            for (name, _), value in zip(routes, values):
+                if name not in scopes:
+                    if pending:
+                        break
+
+                    return _fallback(endpoint, default, args, kwargs)
+
+                digs = overloads[name].harvest(scopes[name], value)
+                if not digs:
+                    break
+
+                visible = record.mask_of(digs)
+                if pending:
+                    visible &= ~pending
+                    if not visible:
+                        break
+
+                mask = visible if mask is None else mask & visible
+            else:
+                if not mask:
+                    return _fallback(endpoint, default, args, kwargs)
+
+                return _invoke(endpoint, record, mask, args, kwargs)
+
+        if (LAZY_PROVIDERS or LAZY_GROUPS) and load_providers(endpoint):
+            return dispatcher(*args, **kwargs)
+
+        return _fallback(endpoint, default, args, kwargs)
+
+    dispatcher.__wrapped__ = endpoint.target  # type: ignore
+    return dispatcher
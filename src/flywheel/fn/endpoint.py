@@ -1,17 +1,46 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Callable, Generator, Generic, Protocol, TypeVar, overload
+import weakref
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Callable, Generator, Generic, Protocol, Sequence, TypeVar, overload
 
 from typing_extensions import Concatenate, Self
 
 from ..typing import CQ, K1, P1, P2, C, CnQ, CnR, P, R, T
+from .batch import BatchSelection
+from .dispatch import ArgumentSource, compile_dispatch
 from .implement import FnImplementEntity
 from .record import CollectSignal, FnRecordLabel
 from .selection import Candidates
 
+if TYPE_CHECKING:
+    from .cache import HarvestCache
+    from .overload import FnOverload
+
 CollectEndpointTarget = Generator[CollectSignal, None, T]
 
+
+class PlanStamp:
+    __slots__ = ("version",)
+
+    version: int
+
+    def __init__(self) -> None:
+        self.version = 0
+
+
+# equal endpoints share one stamp; held weakly by target so a dropped endpoint takes its stamp with it.
+PLAN_STAMPS: weakref.WeakKeyDictionary[Callable, PlanStamp] = weakref.WeakKeyDictionary()
+
+
+def _stamp_of(target: Callable) -> PlanStamp:
+    try:
+        return PLAN_STAMPS.setdefault(getattr(target, "__func__", target), PlanStamp())
+    except TypeError:
+        return PlanStamp()
+
+
 A = TypeVar("A")
 B = TypeVar("B", contravariant=True)
 
@@ -28,6 +57,7 @@ class EndpointCollectReceiver(Protocol[CnR]):
 @dataclass(init=False, eq=True, unsafe_hash=True)
 class FnCollectEndpoint(Generic[P, CnQ]):
     target: Callable[P, CollectEndpointTarget]
+    stamp: PlanStamp = field(init=False, repr=False, compare=False)
 
     @overload
     def __init__(self: FnCollectEndpoint[P1, Callable[P2, R]], target: Callable[P1, CollectEndpointTarget[Callable[P2, R]]]): ...
@@ -37,15 +67,21 @@ class FnCollectEndpoint(Generic[P, CnQ]):
 
     def __init__(self, target):
         self.target = target
+        self.stamp = _stamp_of(target)
 
     @property
     def descriptor(self):
         return FnCollectDescriptor(self)
 
-    @property
+    @cached_property
     def signature(self):
         return FnRecordLabel(self)
 
+    @cached_property
+    def qualname(self) -> str:
+        target = getattr(self.target, "__func__", self.target)
+        return f"{target.__module__}:{target.__qualname__}"
+
     def __call__(self: FnCollectEndpoint[P1, CQ], *args: P1.args, **kwargs: P1.kwargs) -> EndpointCollectReceiver[CQ]:
         def receiver(entity: C | FnImplementEntity[C]) -> FnImplementEntity[C]:
             if not isinstance(entity, FnImplementEntity):
@@ -56,8 +92,16 @@ class FnCollectEndpoint(Generic[P, CnQ]):
 
         return receiver  # type: ignore
 
-    def select(self: FnCollectEndpoint[..., C], expect_complete: bool = True) -> Candidates[C]:
-        return Candidates(self, expect_complete)
+    def select(self: FnCollectEndpoint[..., C], expect_complete: bool = True, *, cache: HarvestCache | None = None) -> Candidates[C]:
+        return Candidates(self, expect_complete, cache)
+
+    def dispatch(self: FnCollectEndpoint[..., C], *, default: C | None = None, **sources: ArgumentSource) -> C:
+        return compile_dispatch(self, sources, default)  # type: ignore
+
+    def select_many(
+        self: FnCollectEndpoint[..., C], overload: FnOverload, values: Sequence[Any], *, cache: HarvestCache | None = None
+    ) -> BatchSelection[C]:
+        return BatchSelection.build(self, overload, values, cache)
 
 
 @dataclass
@@ -112,8 +156,22 @@ class FnCollectEndpointAgent(Generic[P, CnQ, A, B]):
 
         return receiver
 
-    def select(self: FnCollectEndpointAgent[..., C, Any, Any], expect_complete: bool = True) -> Candidates[C]:
-        return self.endpoint.select(expect_complete)
+    def select(
+        self: FnCollectEndpointAgent[..., C, Any, Any], expect_complete: bool = True, *, cache: HarvestCache | None = None
+    ) -> Candidates[C]:
+        return self.endpoint.select(expect_complete, cache=cache)
+
+    def dispatch(self: FnCollectEndpointAgent[..., C, Any, Any], *, default: C | None = None, **sources: ArgumentSource) -> C:
+        return self.endpoint.dispatch(default=default, **sources)
+
+    def select_many(
+        self: FnCollectEndpointAgent[..., C, Any, Any],
+        overload: FnOverload,
+        values: Sequence[Any],
+        *,
+        cache: HarvestCache | None = None,
+    ) -> BatchSelection[C]:
+        return self.endpoint.select_many(overload, values, cache=cache)
 
 
 @overload
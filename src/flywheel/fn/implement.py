@@ -1,19 +1,42 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Callable, Generic
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Generic, Sequence, Union
 
 from ..context import CollectContext
 from ..entity import BaseEntity
-from ..globals import COLLECTING_IMPLEMENT_ENTITY, COLLECTING_TARGET_RECORD
+from ..globals import COLLECTING_IMPLEMENT_ENTITY, COLLECTING_TARGET_RECORD, invalidate_plans
 from ..typing import CR, P, R, cvar
-from .record import FnRecord
+from .record import CollectSignal, FnRecord
 
 if TYPE_CHECKING:
     from .endpoint import CollectEndpointTarget, FnCollectEndpoint
 
 
+class WeakImplement:
+    __slots__ = ("ref",)
+
+    ref: weakref.ReferenceType[Callable]
+
+    def __init__(self, implement: Callable, callback: Callable[[WeakImplement], Any]):
+        self.ref = weakref.ref(implement, lambda _: callback(self))
+
+    def __call__(self, *args, **kwargs):
+        implement = self.ref()
+        if implement is None:
+            raise ReferenceError("implementation has been garbage-collected")
+
+        return implement(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self.ref(), name)
+
+    def __repr__(self) -> str:
+        return f"<WeakImplement {self.ref()!r}>"
+
+
 class FnImplementEntity(Generic[CR], BaseEntity):
-    targets: list[tuple[FnCollectEndpoint, CollectEndpointTarget]]
+    targets: list[tuple[FnCollectEndpoint, Union[CollectEndpointTarget, tuple[CollectSignal, ...]]]]
     impl: CR
 
     def __init__(self, impl: CR):
@@ -23,21 +46,50 @@ class FnImplementEntity(Generic[CR], BaseEntity):
     def add_target(self, endpoint: FnCollectEndpoint[P, Any], generator: CollectEndpointTarget):
         self.targets.append((endpoint, generator))
 
-    def collect(self, collector: CollectContext):
+    def resolve_targets(self, collector: CollectContext) -> list[tuple[FnRecord, Sequence[CollectSignal]]]:
+        if collector.frozen:
+            raise RuntimeError(f"cannot collect {self.impl!r} into a frozen {collector.__class__.__name__}")
+
         super().collect(collector)
 
+        resolved = []
         with cvar(COLLECTING_IMPLEMENT_ENTITY, self):
-            for endpoint, generator in self.targets:
+            for position, (endpoint, signals) in enumerate(self.targets):
                 record_signature = endpoint.signature
+                record = collector.fn_implements.get(record_signature)
+                created = record is None
+
+                if created:
+                    record = FnRecord()
+
+                if not isinstance(signals, tuple):
+                    with cvar(COLLECTING_TARGET_RECORD, record):
+                        signals = tuple(signals)
+
+                    self.targets[position] = (endpoint, signals)
+
+                record.reserve(collector.implement_of(self.impl))
+
+                # a new record only becomes reachable once its implementation is reserved, so readers never see it empty.
+                if created:
+                    collector.fn_implements[record_signature] = record
+                    invalidate_plans(endpoint)
+
+                resolved.append((record, signals))
+
+        return resolved
+
+    def collect(self, collector: CollectContext):
+        with collector.lock:
+            implement = collector.implement_of(self.impl)
+
+            for record, signals in self.resolve_targets(collector):
+                for signal in signals:
+                    signal.overload.lay(record, signal.value, implement)
 
-                if record_signature in collector.fn_implements:
-                    record = collector.fn_implements[record_signature]
-                else:
-                    record = collector.fn_implements[record_signature] = FnRecord()
+                record.publish(implement)
 
-                with cvar(COLLECTING_TARGET_RECORD, record):
-                    for signal in generator:
-                        signal.overload.lay(record, signal.value, self.impl)
+            collector.touch()
 
         return self
 
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Callable, Generic, TypeVar
+import sys
+from typing import Callable, Generic, Hashable, Iterable, Mapping, TypeVar
 
 from typing_extensions import final
 
-from .record import CollectSignal, FnRecord
+from .record import EMPTY_IMPLEMENTS, CollectSignal, FnFrozenImplementSet, FnImplementSet, FnRecord
 
 TOverload = TypeVar("TOverload", bound="FnOverload", covariant=True)
 TCallValue = TypeVar("TCallValue")
@@ -21,21 +22,67 @@ class FnOverload(Generic[TSignature, TCollectValue, TCallValue]):
         return CollectSignal(self, value)
 
     @final
-    def dig(self, record: FnRecord, call_value: TCallValue, *, name: str | None = None) -> dict[Callable, None]:
+    def dig(self, record: FnRecord, call_value: TCallValue, *, name: str | None = None) -> Mapping[Callable, None]:
         name = name or self.name
-        if name not in record.scopes:
+        scope = record.scopes.get(name)
+        if scope is None:
+            if record.pending:
+                return EMPTY_IMPLEMENTS
+
             raise NotImplementedError("cannot lookup any implementation with given arguments")
 
-        return self.harvest(record.scopes[name], call_value)
+        return self.harvest(scope, call_value)
 
     @final
     def lay(self, record: FnRecord, collect_value: TCollectValue, implement: Callable, *, name: str | None = None):
+        self.lay_many(record, ((collect_value, implement),), name=name)
+
+    @final
+    def lay_many(self, record: FnRecord, items: Iterable[tuple[TCollectValue, Callable]], *, name: str | None = None):
+        self.place_many(record, ((self.digest(collect_value), implement) for collect_value, implement in items), name=name)
+
+    @final
+    def place_many(self, record: FnRecord, items: Iterable[tuple[TSignature, Callable]], *, name: str | None = None):
         name = name or self.name
         if name not in record.scopes:
-            record.scopes[name] = {}
+            record.scopes[name] = self.new_scope()
+            record.overloads[name] = self
+
+        scope = record.scopes[name]
+        for signature, implement in items:
+            collection = self.collect(scope, signature)
+            collection[implement] = None
+
+            if isinstance(collection, FnImplementSet):
+                collection.mask |= 1 << record.assign(implement)
+            else:
+                record.assign(implement)
+
+            slots = record.signatures[implement]
+            if (name, signature) not in slots:
+                slots.append((name, signature))
+
+        record.version += 1
+
+    def new_scope(self) -> dict:
+        return {}
+
+    def freeze(self, scope: dict, intern: Callable[[Mapping[Callable, None]], FnFrozenImplementSet]) -> dict:
+        frozen = self.new_scope()
+
+        for key, value in scope.items():
+            if isinstance(key, str):
+                key = sys.intern(key)
+
+            frozen[key] = intern(value) if isinstance(value, FnImplementSet) else value
+
+        return frozen
+
+    def prune(self, scope: dict, signature: TSignature, collection: dict[Callable, None]):
+        pass
 
-        collection = self.collect(record.scopes[name], self.digest(collect_value))
-        collection[implement] = None
+    def cache_key(self, call_value: TCallValue) -> Hashable:
+        return call_value  # type: ignore
 
     def digest(self, collect_value: TCollectValue) -> TSignature:
         raise NotImplementedError
@@ -43,7 +90,7 @@ class FnOverload(Generic[TSignature, TCollectValue, TCallValue]):
     def collect(self, scope: dict, signature: TSignature) -> dict[Callable, None]:
         raise NotImplementedError
 
-    def harvest(self, scope: dict, call_value: TCallValue) -> dict[Callable, None]:
+    def harvest(self, scope: dict, call_value: TCallValue) -> Mapping[Callable, None]:
         raise NotImplementedError
 
     def access(self, scope: dict, signature: TSignature) -> dict[Callable, None] | None:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping, Sequence
 
 if TYPE_CHECKING:
     from .endpoint import FnCollectEndpoint
@@ -10,16 +10,242 @@ if TYPE_CHECKING:
 
 @dataclass(eq=True, frozen=True)
 class FnRecordLabel:
+    __slots__ = ("endpoint",)
+
     endpoint: FnCollectEndpoint
 
 
-@dataclass(eq=True, frozen=True)
+class FnImplementSet(dict):
+    __slots__ = ("mask",)
+
+    mask: int
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mask = 0
+
+
+class FnFrozenImplementSet(Mapping[Callable, None]):
+    __slots__ = ("members", "mask")
+
+    members: tuple[Callable, ...]
+    mask: int
+
+    def __init__(self, members: tuple[Callable, ...], mask: int):
+        self.members = members
+        self.mask = mask
+
+    def __getitem__(self, key: Callable) -> None:
+        if key not in self.members:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.members
+
+    def __iter__(self) -> Iterator[Callable]:
+        return iter(self.members)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __bool__(self) -> bool:
+        return bool(self.members)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.members!r})"
+
+
+EMPTY_IMPLEMENTS = FnFrozenImplementSet((), 0)
+
+# a record is rebuilt once at least this many slots are tombstones and they make up half of its order.
+COMPACT_THRESHOLD = 64
+
+
 class FnRecord:
-    scopes: dict[str, dict[Any, Any]] = field(default_factory=dict)
-    entities: dict[frozenset[tuple[str, "FnOverload", Any]], Callable] = field(default_factory=dict)
+    __slots__ = (
+        "scopes",
+        "entities",
+        "implements",
+        "order",
+        "wrappers",
+        "overloads",
+        "signatures",
+        "pending",
+        "version",
+        "tombstones",
+    )
+
+    scopes: dict[str, dict[Any, Any]]
+    entities: dict[frozenset[tuple[str, FnOverload, Any]], Callable]
+    implements: dict[Callable, int]
+    order: Sequence[Callable]
+    wrappers: dict[Callable, Callable]
+    overloads: dict[str, FnOverload]
+    signatures: dict[Callable, list[tuple[str, Any]]]
+    pending: int
+    version: int
+    tombstones: int
+
+    def __init__(self) -> None:
+        self.scopes = {}
+        self.entities = {}
+        self.implements = {}
+        self.order = []
+        self.wrappers = {}
+        self.overloads = {}
+        self.signatures = {}
+        self.pending = 0
+        self.version = 0
+        self.tombstones = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(scopes={self.scopes!r}, entities={self.entities!r})"
+
+    def assign(self, implement: Callable) -> int:
+        if implement in self.implements:
+            return self.implements[implement]
+
+        index = self.implements[implement] = len(self.order)
+        self.order.append(implement)  # type: ignore
+        self.signatures[implement] = []
+        return index
+
+    def reserve(self, implement: Callable) -> int:
+        # hidden from readers until publish(), so a half-laid implementation is never selected.
+        if implement in self.implements:
+            return self.implements[implement]
+
+        index = self.assign(implement)
+        self.pending |= 1 << index
+        return index
+
+    def publish(self, implement: Callable):
+        if implement in self.implements:
+            self.pending &= ~(1 << self.implements[implement])
+
+        self.version += 1
+
+    def discard(self, implement: Callable) -> bool:
+        if implement not in self.implements:
+            return False
+
+        bit = 1 << self.implements[implement]
+        self.pending |= bit
+
+        for name, signature in self.signatures.pop(implement, ()):
+            overload = self.overloads[name]
+            scope = self.scopes[name]
+            collection = overload.access(scope, signature)
+
+            if collection is not None and implement in collection:
+                del collection[implement]
+
+                if isinstance(collection, FnImplementSet):
+                    collection.mask &= ~bit
+
+                overload.prune(scope, signature, collection)
+
+        # the slot stays a tombstone until compact(): readers may still hold masks that carry its bit.
+        index = self.implements.pop(implement)
+        self.order[index] = None  # type: ignore
+        self.wrappers.pop(implement, None)
+        self.tombstones += 1
+        self.pending &= ~bit
+        self.version += 1
+        return True
+
+    @property
+    def sparse(self) -> bool:
+        return self.tombstones >= COMPACT_THRESHOLD and self.tombstones * 2 >= len(self.order)
+
+    def compact(self) -> FnRecord:
+        # built as a new record rather than in place, so readers still walking this one keep consistent masks.
+        record = FnRecord()
+        batches: dict[str, list[tuple[Any, Callable]]] = {}
+
+        for name, overload in self.overloads.items():
+            record.scopes[name] = overload.new_scope()
+            record.overloads[name] = overload
+            batches[name] = []
+
+        for implement in self.order:
+            if implement is None:
+                continue
+
+            record.assign(implement)
+            for name, signature in self.signatures[implement]:
+                batches[name].append((signature, implement))
+
+            if implement in self.wrappers:
+                record.wrappers[implement] = self.wrappers[implement]
+
+        for name, items in batches.items():
+            self.overloads[name].place_many(record, items, name=name)
+
+        return record
+
+    def mask_of(self, collection: Mapping[Callable, None]) -> int:
+        if isinstance(collection, (FnImplementSet, FnFrozenImplementSet)):
+            return collection.mask
+
+        mask = 0
+        for implement in collection:
+            if implement in self.implements:
+                mask |= 1 << self.implements[implement]
+
+        return mask
+
+    def first(self, mask: int) -> Callable:
+        implement = self.order[(mask & -mask).bit_length() - 1]
+        if implement is not None:
+            return implement
+
+        for implement in self.members(mask):
+            return implement
+
+        raise NotImplementedError("cannot lookup any implementation with given arguments")
+
+    def members(self, mask: int) -> Iterator[Callable]:
+        order = self.order
+
+        while mask:
+            low = mask & -mask
+            implement = order[low.bit_length() - 1]
+            if implement is not None:
+                yield implement
+
+            mask ^= low
+
+    def freeze(self, endpoint: FnCollectEndpoint):
+        from .selection import wrap_implement
+
+        interned: dict[int, FnFrozenImplementSet] = {}
+
+        def intern(collection: Mapping[Callable, None]) -> FnFrozenImplementSet:
+            mask = self.mask_of(collection)
+            if not mask:
+                return EMPTY_IMPLEMENTS
+
+            if mask not in interned:
+                interned[mask] = FnFrozenImplementSet(tuple(self.members(mask)), mask)
+
+            return interned[mask]
+
+        for name, scope in self.scopes.items():
+            if name in self.overloads:
+                self.scopes[name] = self.overloads[name].freeze(scope, intern)
+
+        self.order = tuple(self.order)
+        for implement in self.implements:
+            if implement not in self.wrappers:
+                self.wrappers[implement] = wrap_implement(endpoint, implement)
+
+        self.version += 1
 
 
 @dataclass(eq=True, frozen=True)
 class CollectSignal:
+    __slots__ = ("overload", "value")
+
     overload: FnOverload
     value: Any
@@ -1,87 +1,260 @@
 from __future__ import annotations
 
+import asyncio
 import functools
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Callable, Generic, Iterator
+import inspect
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Generic, Iterator, Mapping
 
-from flywheel.globals import CALLER_TOKENS, iter_layout
+from flywheel.globals import CALLER_TOKENS, CallerToken, caller_index, lookup_plan
+from flywheel.lazy import LAZY_GROUPS, LAZY_PROVIDERS, load_providers
+from flywheel.probes import PROBES, observe_call, observe_miss
 
 from ..typing import C, P, R
+from .record import EMPTY_IMPLEMENTS
 
 if TYPE_CHECKING:
+    from .cache import HarvestCache, HarvestKey
     from .endpoint import FnCollectEndpoint
     from .overload import FnOverload, TCallValue
     from .record import FnRecord
 
 
-@dataclass
+def wrap_implement(endpoint: FnCollectEndpoint, raw: C) -> C:
+    @functools.wraps(raw)
+    def wrapper(*args, **kwargs):
+        parent = CALLER_TOKENS.get()
+        index = 0 if parent is None else caller_index(endpoint, parent) + 1
+        _tok = CALLER_TOKENS.set(CallerToken(endpoint, index, parent))
+
+        try:
+            return raw(*args, **kwargs)
+        finally:
+            CALLER_TOKENS.reset(_tok)
+
+    return wrapper  # type: ignore
+
+
 class Candidates(Generic[C]):
+    __slots__ = ("endpoint", "expect_complete", "cache")
+
     endpoint: FnCollectEndpoint[..., C]
-    expect_complete: bool = False
+    expect_complete: bool
+    cache: HarvestCache | None
+
+    def __init__(self, endpoint: FnCollectEndpoint[..., C], expect_complete: bool = False, cache: HarvestCache | None = None):
+        self.endpoint = endpoint
+        self.expect_complete = expect_complete
+        self.cache = cache
 
     def __iter__(self) -> Iterator[Selection[C]]:
-        sig = self.endpoint.signature
+        index = caller_index(self.endpoint)
+        start = perf_counter_ns() if PROBES else 0
+        layers = 0
 
         last_selection = None
         try:
-            for layer in iter_layout(self.endpoint):
-                if sig in layer.fn_implements:
-                    last_selection = Selection(layer.fn_implements[sig], self.endpoint)
-                    yield last_selection
-                    if last_selection.completed:
-                        break
+            while True:
+                for layer_index, record in lookup_plan(self.endpoint):
+                    if layer_index > index:
+                        layers += 1
+                        last_selection = Selection(record, self.endpoint, cache=self.cache, layer=layer_index)
+
+                        if start:
+                            hop = perf_counter_ns()
+                            yield last_selection
+                            end = perf_counter_ns()
+                            for probe in PROBES:
+                                probe.layer(self.endpoint, layer_index, hop, end)
+                        else:
+                            yield last_selection
+
+                        if last_selection.completed:
+                            return
+
+                if not (LAZY_PROVIDERS or LAZY_GROUPS) or not load_providers(self.endpoint):
+                    break
         finally:
-            if self.expect_complete and (last_selection is None or not last_selection.completed):
+            completed = last_selection is not None and last_selection.completed
+
+            if start:
+                end = perf_counter_ns()
+                for probe in PROBES:
+                    probe.lookup(self.endpoint, layers, completed, start, end)
+
+            if self.expect_complete and not completed:
+                if PROBES:
+                    observe_miss(self.endpoint)
+
                 raise NotImplementedError("cannot lookup any implementation with given arguments")
 
 
-@dataclass
 class Selection(Generic[C]):
+    __slots__ = ("record", "endpoint", "mask", "completed", "cache", "key", "layer")
+
     record: FnRecord
     endpoint: FnCollectEndpoint[..., C]
-    result: dict[C, None] | None = None
-    completed: bool = False
+    mask: int | None
+    completed: bool
+    cache: HarvestCache | None
+    key: HarvestKey
+    layer: int
+
+    def __init__(
+        self,
+        record: FnRecord,
+        endpoint: FnCollectEndpoint[..., C],
+        mask: int | None = None,
+        completed: bool = False,
+        cache: HarvestCache | None = None,
+        key: HarvestKey = (),
+        layer: int = -1,
+    ):
+        self.record = record
+        self.endpoint = endpoint
+        self.mask = mask
+        self.completed = completed
+        self.cache = cache
+        self.key = key
+        self.layer = layer
+
+    @property
+    def result(self) -> dict[C, None] | None:
+        if self.mask is None:
+            return None
+
+        return dict.fromkeys(self.record.members(self.mask))  # type: ignore
+
+    def accept(self, collection: Mapping[Callable, None]):
+        mask = self.record.mask_of(collection)
 
-    def accept(self, collection: dict[Callable, None]):
-        if self.result is None:
-            self.result = collection  # type: ignore
+        pending = self.record.pending
+        if pending:
+            mask &= ~pending
+
+        if self.mask is None:
+            self.mask = mask
         else:
-            self.result = dict(self.result.items() & collection.items())
+            self.mask &= mask
 
     def harvest(self, overload: FnOverload[Any, Any, TCallValue], value: TCallValue):
+        start = perf_counter_ns() if PROBES else 0
+
+        if self.cache is not None:
+            self.key = (*self.key, (overload, overload.cache_key(value)))
+            cached = self.cache.lookup(self.record, self.key)
+
+            if cached is not None:
+                digs, self.mask = cached
+                if start:
+                    self._observe_harvest(overload, start)
+
+                return digs
+
         digs = overload.dig(self.record, value)
         self.accept(digs)
+
+        pending = self.record.pending
+        if pending and digs and not self.record.mask_of(digs) & ~pending:
+            digs = EMPTY_IMPLEMENTS
+
+        if self.cache is not None:
+            self.cache.store(self.record, self.key, digs, self.mask)  # type: ignore
+
+        if start:
+            self._observe_harvest(overload, start)
+
         return digs
 
+    def _observe_harvest(self, overload: FnOverload, start: int):
+        end = perf_counter_ns()
+        for probe in PROBES:
+            probe.harvest(self.endpoint, overload, self.layer, not self.mask, start, end)
+
     def complete(self):
         self.completed = True
 
     def _wraps(self, raw: C) -> C:
-        @functools.wraps(raw)
-        def wrapper(*args, **kwargs):
-            tokens = CALLER_TOKENS.get()
-            current_index = tokens.get(self.endpoint, -1)
-            _tok = CALLER_TOKENS.set({**tokens, self.endpoint: current_index + 1})
-
-            try:
-                return raw(*args, **kwargs)
-            finally:
-                CALLER_TOKENS.reset(_tok)
+        wrapper = self.record.wrappers.get(raw)
+        if wrapper is None:
+            wrapper = self.record.wrappers[raw] = wrap_implement(self.endpoint, raw)
 
         return wrapper  # type: ignore
 
     def __iter__(self):
-        if self.result is None:
+        if self.mask is None:
+            if PROBES:
+                observe_miss(self.endpoint)
+
             raise NotImplementedError("cannot lookup any implementation with given arguments")
 
-        for raw in self.result:
+        for raw in self.record.members(self.mask):
             yield self._wraps(raw)
 
     def __call__(self: Selection[Callable[P, R]], *args: P.args, **kwargs: P.kwargs) -> R:
-        for i in self:
-            return i(*args, **kwargs)
+        if self.mask:
+            raw = self.record.first(self.mask)
+            if PROBES:
+                return observe_call(self.endpoint, raw, self._wraps(raw), args, kwargs)
+
+            return self._wraps(raw)(*args, **kwargs)
+
+        if PROBES:
+            observe_miss(self.endpoint)
 
         raise NotImplementedError("cannot lookup any implementation with given arguments")
 
+    async def _invoke(self, raw: Callable, args: tuple, kwargs: dict, semaphore: asyncio.Semaphore | None = None):
+        if semaphore is not None:
+            async with semaphore:
+                return await self._invoke(raw, args, kwargs)
+
+        parent = CALLER_TOKENS.get()
+        _tok = CALLER_TOKENS.set(CallerToken(self.endpoint, caller_index(self.endpoint, parent) + 1, parent))
+
+        try:
+            result = raw(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+
+            return result
+        finally:
+            CALLER_TOKENS.reset(_tok)
+
+    def _invocations(self, args: tuple, kwargs: dict, concurrency: int | None) -> list[Awaitable[Any]]:
+        if self.mask is None:
+            raise NotImplementedError("cannot lookup any implementation with given arguments")
+
+        semaphore = asyncio.Semaphore(concurrency) if concurrency is not None else None
+        return [self._invoke(raw, args, kwargs, semaphore) for raw in self.record.members(self.mask)]
+
+    async def call(self: Selection[Callable[P, Awaitable[R]]], *args: P.args, **kwargs: P.kwargs) -> R:
+        if self.mask:
+            return await self._invoke(self.record.first(self.mask), args, kwargs)
+
+        raise NotImplementedError("cannot lookup any implementation with given arguments")
+
+    async def gather(
+        self: Selection[Callable[..., Awaitable[R]]],
+        *args: Any,
+        concurrency: int | None = None,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> list[R]:
+        return await asyncio.gather(*self._invocations(args, kwargs, concurrency), return_exceptions=return_exceptions)
+
+    async def as_completed(
+        self: Selection[Callable[..., Awaitable[R]]], *args: Any, concurrency: int | None = None, **kwargs: Any
+    ) -> AsyncIterator[R]:
+        tasks = [asyncio.ensure_future(i) for i in self._invocations(args, kwargs, concurrency)]
+
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
     def __bool__(self):
-        return bool(self.result)
+        return bool(self.mask)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import itertools
 from contextlib import contextmanager
 from contextvars import ContextVar
-from typing import TYPE_CHECKING, Tuple
+from typing import TYPE_CHECKING, NamedTuple, Optional, Tuple
 
 from .context import CollectContext, InstanceContext
 from .typing import TEntity
@@ -22,17 +23,74 @@ COLLECTING_TARGET_RECORD: ContextVar[FnRecord] = ContextVar("CollectingTargetRec
 LOOKUP_LAYOUT_VAR = ContextVar[Tuple[CollectContext, ...]]("LookupContext", default=(GLOBAL_COLLECT_CONTEXT,))
 INSTANCE_CONTEXT_VAR = ContextVar("InstanceContext", default=GLOBAL_INSTANCE_CONTEXT)
 
-CALLER_TOKENS: ContextVar[dict[FnCollectEndpoint, int]] = ContextVar("CallerTokens", default={})
+
+class CallerToken(NamedTuple):
+    endpoint: FnCollectEndpoint
+    index: int
+    parent: CallerToken | None
+
+
+CALLER_TOKENS = ContextVar[Optional[CallerToken]]("CallerTokens", default=None)
+
+PLAN_CACHE_SIZE = 64
+PLAN_TICKETS = itertools.count(1)
+
+
+def caller_index(endpoint: FnCollectEndpoint, token: CallerToken | None = None) -> int:
+    if token is None:
+        token = CALLER_TOKENS.get()
+
+    while token is not None:
+        if token.endpoint is endpoint or token.endpoint == endpoint:
+            return token.index
+
+        token = token.parent
+
+    return -1
 
 
 def iter_layout(endpoint: FnCollectEndpoint):
-    index = CALLER_TOKENS.get().get(endpoint, -1)
+    index = caller_index(endpoint)
     contexts = LOOKUP_LAYOUT_VAR.get()
 
     for layer in contexts[index + 1 :]:
         yield layer
 
 
+def lookup_plan(endpoint: FnCollectEndpoint) -> tuple[tuple[int, FnRecord], ...]:
+    layout = LOOKUP_LAYOUT_VAR.get()
+    if not layout:
+        return ()
+
+    stamp = endpoint.stamp
+    plans = layout[0].plans.get(stamp)
+
+    if plans is not None:
+        cached = plans.get(layout)
+        if cached is not None and cached[0] == stamp.version:
+            return cached[1]
+
+    # plans live on the innermost layer, so they are dropped together with the scope that built them.
+    plans = layout[0].plans.setdefault(stamp, {})
+    if len(plans) >= PLAN_CACHE_SIZE:
+        plans.clear()
+
+    sig = endpoint.signature
+    while True:
+        version = stamp.version
+        plan = tuple((index, layer.fn_implements[sig]) for index, layer in enumerate(layout) if sig in layer.fn_implements)
+        plans[layout] = (version, plan)
+
+        # a writer that added a record while we were building has moved the stamp on; build again against the new one.
+        if stamp.version == version:
+            return plan
+
+
+def invalidate_plans(endpoint: FnCollectEndpoint):
+    # tickets are unique, so concurrent writers on different contexts can never restore a version a stale plan carries.
+    endpoint.stamp.version = next(PLAN_TICKETS)
+
+
 def global_collect(entity: TEntity) -> TEntity:
     return GLOBAL_COLLECT_CONTEXT.collect(entity)
 
@@ -25,4 +25,11 @@ class InstanceOf(Generic[T]):
         if instance is None:
             return self
 
-        return INSTANCE_CONTEXT_VAR.get().instances[self.target]
+        context = INSTANCE_CONTEXT_VAR.get()
+        if context.resolved_at == context.generation:
+            try:
+                return context.resolved[self.target]
+            except KeyError:
+                pass
+
+        return context.lookup(self.target)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import importlib
+import threading
+from typing import TYPE_CHECKING
+
+from .context import CollectContext
+
+if TYPE_CHECKING:
+    from .fn.endpoint import FnCollectEndpoint, FnCollectEndpointAgent
+
+LAZY_PROVIDERS: dict[str, list[str]] = {}
+LAZY_GROUPS: list[str] = []
+
+_LOCK = threading.RLock()
+
+
+def provide(endpoint: FnCollectEndpoint | FnCollectEndpointAgent | str, *modules: str):
+    path = endpoint if isinstance(endpoint, str) else getattr(endpoint, "endpoint", endpoint).qualname
+
+    with _LOCK:
+        LAZY_PROVIDERS.setdefault(path, []).extend(modules)
+        # a pending provider changes what a miss resolves to, so cached resolutions must not outlive it.
+        CollectContext.clock += 1
+
+
+def use_entry_points(group: str = "flywheel.providers"):
+    with _LOCK:
+        if group not in LAZY_GROUPS:
+            LAZY_GROUPS.append(group)
+            CollectContext.clock += 1
+
+
+def _scan_groups():
+    from importlib.metadata import entry_points
+
+    eps = entry_points()
+
+    for group in LAZY_GROUPS:
+        selected = eps.select(group=group) if hasattr(eps, "select") else eps.get(group, [])  # type: ignore
+
+        for ep in selected:
+            LAZY_PROVIDERS.setdefault(ep.name, []).append(ep.module)
+
+    LAZY_GROUPS.clear()
+
+
+def load_providers(endpoint: FnCollectEndpoint) -> bool:
+    if LAZY_GROUPS:
+        with _LOCK:
+            _scan_groups()
+
+    path = endpoint.qualname
+    if path not in LAZY_PROVIDERS:
+        return False
+
+    with _LOCK:
+        modules = LAZY_PROVIDERS.get(path, [])
+
+        while modules:
+            module = modules[0]
+            importlib.import_module(module)
+
+            # dropped only once imported, so a provider that raises stays queued with the ones after it and the next miss retries.
+            if module in modules:
+                modules.remove(module)
+
+        LAZY_PROVIDERS.pop(path, None)
+
+    return True
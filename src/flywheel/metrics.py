@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable
+
+from .probes import PROBES, DispatchProbe, attach, detach
+
+if TYPE_CHECKING:
+    from .fn.endpoint import FnCollectEndpoint
+    from .fn.overload import FnOverload
+
+# upper bounds in nanoseconds, powers of two from 256ns to ~1s; the last bucket is unbounded.
+BUCKET_BOUNDS = tuple(1 << shift for shift in range(8, 31))
+
+
+@dataclass
+class LatencyHistogram:
+    count: int = 0
+    total: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(BUCKET_BOUNDS) + 1))
+
+    def observe(self, elapsed: int):
+        self.count += 1
+        self.total += elapsed
+        self.buckets[min(max(elapsed.bit_length() - 8, 0), len(BUCKET_BOUNDS))] += 1
+
+    def export(self) -> dict[str, Any]:
+        buckets = {str(bound): count for bound, count in zip(BUCKET_BOUNDS, self.buckets) if count}
+        if self.buckets[-1]:
+            buckets["+Inf"] = self.buckets[-1]
+
+        return {"count": self.count, "sum_ns": self.total, "buckets": buckets}
+
+
+@dataclass
+class EndpointMetrics:
+    lookups: int = 0
+    layers: int = 0
+    harvests: int = 0
+    empty: int = 0
+    calls: int = 0
+    misses: int = 0
+    lookup_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    harvest_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    call_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def export(self) -> dict[str, Any]:
+        return {
+            "lookups": self.lookups,
+            "layers": self.layers,
+            "harvests": self.harvests,
+            "empty": self.empty,
+            "calls": self.calls,
+            "misses": self.misses,
+            "latency": {
+                "lookup": self.lookup_latency.export(),
+                "harvest": self.harvest_latency.export(),
+                "call": self.call_latency.export(),
+            },
+        }
+
+
+class MetricsProbe(DispatchProbe):
+    endpoints: dict[FnCollectEndpoint, EndpointMetrics]
+
+    def __init__(self) -> None:
+        self.endpoints = {}
+
+    def _of(self, endpoint: FnCollectEndpoint) -> EndpointMetrics:
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints.setdefault(endpoint, EndpointMetrics())
+
+        return metrics
+
+    def lookup(self, endpoint: FnCollectEndpoint, layers: int, completed: bool, start: int, end: int):
+        metrics = self._of(endpoint)
+        metrics.lookups += 1
+        metrics.layers += layers
+        metrics.lookup_latency.observe(end - start)
+
+    def harvest(self, endpoint: FnCollectEndpoint, overload: FnOverload, layer_index: int, empty: bool, start: int, end: int):
+        metrics = self._of(endpoint)
+        metrics.harvests += 1
+        metrics.empty += empty
+        metrics.harvest_latency.observe(end - start)
+
+    def call(self, endpoint: FnCollectEndpoint, implement: Callable, start: int, end: int):
+        metrics = self._of(endpoint)
+        metrics.calls += 1
+        metrics.call_latency.observe(end - start)
+
+    def miss(self, endpoint: FnCollectEndpoint):
+        self._of(endpoint).misses += 1
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {endpoint.qualname: metrics.export() for endpoint, metrics in list(self.endpoints.items())}
+
+
+METRICS = MetricsProbe()
+
+
+def enable():
+    attach(METRICS)
+
+
+def disable():
+    detach(METRICS)
+
+
+def enabled() -> bool:
+    return METRICS in PROBES
+
+
+def reset():
+    METRICS.endpoints = {}
+
+
+def snapshot() -> dict[str, dict[str, Any]]:
+    return METRICS.snapshot()
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import Any, Callable, Type
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, Tuple, Type
 
 from .fn.overload import FnOverload
+from .fn.record import EMPTY_IMPLEMENTS, FnFrozenImplementSet, FnImplementSet
 
 
 @dataclass(eq=True, frozen=True)
 class SimpleOverloadSignature:
+    __slots__ = ("value",)
+
     value: Any
 
+    def __reduce__(self):
+        return self.__class__, (self.value,)
+
 
 class SimpleOverload(FnOverload[SimpleOverloadSignature, Any, Any]):
     def digest(self, collect_value: Any) -> SimpleOverloadSignature:
@@ -17,51 +25,421 @@ class SimpleOverload(FnOverload[SimpleOverloadSignature, Any, Any]):
 
     def collect(self, scope: dict, signature: SimpleOverloadSignature) -> dict[Callable, None]:
         if signature.value not in scope:
-            target = scope[signature.value] = {}
+            target = scope[signature.value] = FnImplementSet()
         else:
             target = scope[signature.value]
 
         return target
 
-    def harvest(self, scope: dict, call_value: Any) -> dict[Callable, None]:
-        if call_value in scope:
-            return scope[call_value]
-
-        return {}
+    def harvest(self, scope: dict, call_value: Any) -> Mapping[Callable, None]:
+        return scope.get(call_value, EMPTY_IMPLEMENTS)
 
     def access(self, scope: dict, signature: SimpleOverloadSignature) -> dict[Callable, None] | None:
         if signature.value in scope:
             return scope[signature.value]
 
+    def prune(self, scope: dict, signature: SimpleOverloadSignature, collection: dict[Callable, None]):
+        if not collection:
+            del scope[signature.value]
+
 
 @dataclass(eq=True, frozen=True)
 class TypeOverloadSignature:
+    __slots__ = ("type",)
+
     type: type[Any]
 
+    def __reduce__(self):
+        return self.__class__, (self.type,)
+
+
+class TypeOverloadScope(dict):
+    __slots__ = ("resolved",)
+
+    resolved: dict[type, Mapping[Callable, None] | None]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.resolved = {}
+
 
 class TypeOverload(FnOverload[TypeOverloadSignature, Type[Any], Any]):
+    def __init__(self, name: str, *, mro: bool = False, abc: bool = False) -> None:
+        super().__init__(name)
+        self.mro = mro or abc
+        self.abc = abc
+
+    def new_scope(self) -> dict:
+        if self.mro:
+            return TypeOverloadScope()
+
+        return {}
+
     def digest(self, collect_value: type) -> TypeOverloadSignature:
         return TypeOverloadSignature(collect_value)
 
     def collect(self, scope: dict, signature: TypeOverloadSignature) -> dict[Callable, None]:
         if signature.type not in scope:
-            target = scope[signature.type] = {}
+            target = scope[signature.type] = FnImplementSet()
+
+            if isinstance(scope, TypeOverloadScope):
+                scope.resolved = {}
         else:
             target = scope[signature.type]
 
         return target
 
-    def harvest(self, scope: dict, call_value: Any) -> dict[Callable, None]:
+    def cache_key(self, call_value: Any) -> type[Any]:
+        return type(call_value)
+
+    def harvest(self, scope: dict, call_value: Any) -> Mapping[Callable, None]:
         t = type(call_value)
-        if t in scope:
-            return scope[t]
 
-        return {}
+        if isinstance(scope, TypeOverloadScope):
+            # writers swap in a fresh dict, so a resolution computed against an older scope lands in a discarded cache.
+            resolved = scope.resolved
+            if t in resolved:
+                target = resolved[t]
+            else:
+                target = self.resolve(scope, t)
+
+                # a frozen scope holds a read-only table: types it was not laid with are resolved on every call instead.
+                if type(resolved) is dict:
+                    resolved[t] = target
+
+            if target is not None:
+                return target
+
+            return EMPTY_IMPLEMENTS
+
+        return scope.get(t, EMPTY_IMPLEMENTS)
+
+    def freeze(self, scope: dict, intern: Callable[[Mapping[Callable, None]], FnFrozenImplementSet]) -> dict:
+        frozen = super().freeze(scope, intern)
+
+        if isinstance(frozen, TypeOverloadScope):
+            frozen.resolved = MappingProxyType({t: self.resolve(frozen, t) for t in frozen})  # type: ignore
+
+        return frozen
+
+    def resolve(self, scope: dict, t: type) -> Mapping[Callable, None] | None:
+        best = None
+
+        for base in t.__mro__:
+            if base in scope:
+                best = base
+                break
+
+        if self.abc:
+            for key in tuple(scope):
+                if key is not best and issubclass(t, key) and (best is None or issubclass(key, best)):
+                    best = key
+
+        if best is not None:
+            return scope.get(best)
 
     def access(self, scope: dict, signature: TypeOverloadSignature) -> dict[Callable, None] | None:
         if signature.type in scope:
             return scope[signature.type]
 
+    def prune(self, scope: dict, signature: TypeOverloadSignature, collection: dict[Callable, None]):
+        if not collection:
+            del scope[signature.type]
+
+        if isinstance(scope, TypeOverloadScope):
+            scope.resolved = {}
+
+
+@dataclass(eq=True, frozen=True)
+class RangeOverloadSignature:
+    __slots__ = ("lower", "upper")
+
+    lower: Any
+    upper: Any
+
+    def __reduce__(self):
+        return self.__class__, (self.lower, self.upper)
+
+
+class RangeOverloadScope(dict):
+    __slots__ = ("index", "stamp")
+
+    index: tuple[int, list[Any], list[Any]] | None
+    stamp: int
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.index = None
+        self.stamp = 0
+
+
+class RangeOverload(FnOverload[RangeOverloadSignature, Tuple[Any, Any], Any]):
+    def new_scope(self) -> dict:
+        return RangeOverloadScope()
+
+    def digest(self, collect_value: tuple[Any, Any]) -> RangeOverloadSignature:
+        lower, upper = collect_value
+        if not lower < upper:
+            raise ValueError(f"empty range: [{lower!r}, {upper!r})")
+
+        return RangeOverloadSignature(lower, upper)
+
+    def collect(self, scope: dict, signature: RangeOverloadSignature) -> dict[Callable, None]:
+        key = (signature.lower, signature.upper)
+
+        if key not in scope:
+            target = scope[key] = FnImplementSet()
+        else:
+            target = scope[key]
+
+        if isinstance(scope, RangeOverloadScope):
+            scope.stamp += 1
+            scope.index = None
+
+        return target
+
+    def harvest(self, scope: dict, call_value: Any) -> Mapping[Callable, None]:
+        if not isinstance(scope, RangeOverloadScope):
+            return EMPTY_IMPLEMENTS
+
+        # an index built while a writer was active carries the old stamp and is rebuilt on the next call.
+        index = scope.index
+        if index is None or index[0] != scope.stamp:
+            stamp = scope.stamp
+            index = scope.index = (stamp, *self.build_index(scope))
+
+        _, bounds, segments = index
+        position = bisect_right(bounds, call_value) - 1
+
+        if 0 <= position < len(segments):
+            target = segments[position]
+            if target is not None:
+                return target
+
+        return EMPTY_IMPLEMENTS
+
+    def build_index(self, scope: dict) -> tuple[list[Any], list[FnImplementSet | None]]:
+        items = tuple(scope.items())
+        bounds = sorted({bound for key, _ in items for bound in key})
+        segments: list[FnImplementSet | None] = [None] * max(len(bounds) - 1, 0)
+
+        for (lower, upper), collection in items:
+            for position in range(bisect_left(bounds, lower), bisect_left(bounds, upper)):
+                segment = segments[position]
+                if segment is None:
+                    segment = segments[position] = FnImplementSet()
+
+                segment.update(collection)
+                segment.mask |= collection.mask
+
+        return bounds, segments
+
+    def freeze(self, scope: dict, intern: Callable[[Mapping[Callable, None]], FnFrozenImplementSet]) -> dict:
+        frozen = super().freeze(scope, intern)
+
+        if isinstance(frozen, RangeOverloadScope):
+            bounds, segments = self.build_index(scope)
+            frozen.index = frozen.stamp, bounds, [None if segment is None else intern(segment) for segment in segments]
+
+        return frozen
+
+    def access(self, scope: dict, signature: RangeOverloadSignature) -> dict[Callable, None] | None:
+        key = (signature.lower, signature.upper)
+        if key in scope:
+            return scope[key]
+
+    def prune(self, scope: dict, signature: RangeOverloadSignature, collection: dict[Callable, None]):
+        if not collection:
+            del scope[(signature.lower, signature.upper)]
+
+        if isinstance(scope, RangeOverloadScope):
+            scope.stamp += 1
+            scope.index = None
+
+
+@dataclass(eq=True, frozen=True)
+class PrefixOverloadSignature:
+    __slots__ = ("value",)
+
+    value: str
+
+    def __reduce__(self):
+        return self.__class__, (self.value,)
+
+
+class PrefixOverloadNode:
+    __slots__ = ("children", "target", "cumulative")
+
+    children: dict[str, PrefixOverloadNode]
+    target: FnImplementSet | FnFrozenImplementSet | None
+    cumulative: FnImplementSet | FnFrozenImplementSet | None
+
+    def __init__(self) -> None:
+        self.children = {}
+        self.target = None
+        self.cumulative = None
+
+
+class PrefixOverloadScope(dict):
+    __slots__ = ("root", "stamp", "accumulated")
+
+    root: PrefixOverloadNode
+    stamp: int
+    accumulated: int
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.root = PrefixOverloadNode()
+        self.stamp = 0
+        self.accumulated = 0
+
+
+class PrefixOverload(FnOverload[PrefixOverloadSignature, str, str]):
+    def __init__(self, name: str, *, greed: bool = False) -> None:
+        super().__init__(name)
+        self.greed = greed
+
+    def split(self, value: str) -> Iterable[str]:
+        return value
+
+    def new_scope(self) -> dict:
+        return PrefixOverloadScope()
+
+    def digest(self, collect_value: str) -> PrefixOverloadSignature:
+        return PrefixOverloadSignature(collect_value)
+
+    def collect(self, scope: dict, signature: PrefixOverloadSignature) -> dict[Callable, None]:
+        if signature.value in scope:
+            target = scope[signature.value]
+        else:
+            target = scope[signature.value] = FnImplementSet()
+
+            if isinstance(scope, PrefixOverloadScope):
+                node = scope.root
+                for part in self.split(signature.value):
+                    if part not in node.children:
+                        node.children[part] = PrefixOverloadNode()
+
+                    node = node.children[part]
+
+                node.target = target
+
+        if isinstance(scope, PrefixOverloadScope):
+            scope.stamp += 1
+
+        return target
+
+    def harvest(self, scope: dict, call_value: str) -> Mapping[Callable, None]:
+        if not isinstance(scope, PrefixOverloadScope):
+            return EMPTY_IMPLEMENTS
+
+        if self.greed and scope.accumulated != scope.stamp:
+            self.accumulate(scope)
+
+        node = scope.root
+        found = node if node.target is not None else None
+
+        for part in self.split(call_value):
+            node = node.children.get(part)
+            if node is None:
+                break
+
+            if node.target is not None:
+                found = node
+
+        if found is None:
+            return EMPTY_IMPLEMENTS
+
+        if self.greed:
+            return found.cumulative  # type: ignore
+
+        return found.target  # type: ignore
+
+    def accumulate(self, scope: PrefixOverloadScope):
+        stamp = scope.stamp
+        stack: list[tuple[PrefixOverloadNode, FnImplementSet | FnFrozenImplementSet | None]] = [(scope.root, None)]
+
+        while stack:
+            node, inherited = stack.pop()
+
+            if node.target is None:
+                node.cumulative = inherited
+            elif inherited is None:
+                node.cumulative = node.target
+            else:
+                node.cumulative = FnImplementSet(inherited)
+                node.cumulative.update(node.target)
+                node.cumulative.mask = inherited.mask | node.target.mask
+
+            stack.extend((child, node.cumulative) for child in tuple(node.children.values()))
+
+        scope.accumulated = stamp
+
+    def freeze(self, scope: dict, intern: Callable[[Mapping[Callable, None]], FnFrozenImplementSet]) -> dict:
+        if not isinstance(scope, PrefixOverloadScope):
+            return super().freeze(scope, intern)
+
+        self.accumulate(scope)
+
+        stack = [scope.root]
+        while stack:
+            node = stack.pop()
+            if node.target is not None:
+                node.target = intern(node.target)
+            if node.cumulative is not None:
+                node.cumulative = intern(node.cumulative)
+
+            stack.extend(node.children.values())
+
+        for key, value in scope.items():
+            scope[key] = intern(value)
+
+        return scope
+
+    def access(self, scope: dict, signature: PrefixOverloadSignature) -> dict[Callable, None] | None:
+        if signature.value in scope:
+            return scope[signature.value]
+
+    def prune(self, scope: dict, signature: PrefixOverloadSignature, collection: dict[Callable, None]):
+        if not isinstance(scope, PrefixOverloadScope):
+            if not collection:
+                del scope[signature.value]
+
+            return
+
+        scope.stamp += 1
+        if collection:
+            return
+
+        del scope[signature.value]
+
+        parts = list(self.split(signature.value))
+        path = [scope.root]
+        for part in parts:
+            path.append(path[-1].children[part])
+
+        path[-1].target = None
+
+        # drop the now-empty tail of the trie, deepest node first.
+        for depth in range(len(parts), 0, -1):
+            node = path[depth]
+            if node.target is not None or node.children:
+                break
+
+            del path[depth - 1].children[parts[depth - 1]]
+
+
+class PathOverload(PrefixOverload):
+    def __init__(self, name: str, *, separator: str = ".", greed: bool = False) -> None:
+        super().__init__(name, greed=greed)
+        self.separator = separator
+
+    def split(self, value: str) -> Iterable[str]:
+        if not value:
+            return ()
+
+        return value.split(self.separator)
+
 
 class _SingletonOverloadSignature: ...
 
@@ -76,10 +454,10 @@ class SingletonOverload(FnOverload[_SingletonOverloadSignature, None, None]):
         return SINGLETON_SIGN
 
     def collect(self, scope: dict, signature) -> dict[Callable, None]:
-        s = scope[None] = {}
+        s = scope[None] = FnImplementSet()
         return s
 
-    def harvest(self, scope: dict, call_value) -> dict[Callable, None]:
+    def harvest(self, scope: dict, call_value) -> Mapping[Callable, None]:
         return scope[None]
 
     def access(self, scope: dict, signature) -> dict[Callable, None] | None:
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from .fn.endpoint import FnCollectEndpoint
+    from .fn.overload import FnOverload
+
+PROBES: list[DispatchProbe] = []
+
+_LOCK = threading.Lock()
+
+
+class DispatchProbe:
+    def lookup(self, endpoint: FnCollectEndpoint, layers: int, completed: bool, start: int, end: int): ...
+
+    def layer(self, endpoint: FnCollectEndpoint, layer_index: int, start: int, end: int): ...
+
+    def harvest(self, endpoint: FnCollectEndpoint, overload: FnOverload, layer_index: int, empty: bool, start: int, end: int): ...
+
+    def call(self, endpoint: FnCollectEndpoint, implement: Callable, start: int, end: int): ...
+
+    def miss(self, endpoint: FnCollectEndpoint): ...
+
+
+def attach(probe: DispatchProbe):
+    with _LOCK:
+        if probe not in PROBES:
+            PROBES.append(probe)
+
+
+def detach(probe: DispatchProbe):
+    with _LOCK:
+        if probe in PROBES:
+            PROBES.remove(probe)
+
+
+def observe_call(endpoint: FnCollectEndpoint, implement: Callable, wrapper: Callable, args: tuple, kwargs: dict[str, Any]):
+    start = perf_counter_ns()
+
+    try:
+        return wrapper(*args, **kwargs)
+    finally:
+        end = perf_counter_ns()
+        for probe in PROBES:
+            probe.call(endpoint, implement, start, end)
+
+
+def observe_miss(endpoint: FnCollectEndpoint):
+    for probe in PROBES:
+        probe.miss(endpoint)
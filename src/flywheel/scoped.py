@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import functools
-from typing import Any, Callable
+import weakref
+from typing import Any, Callable, Literal, Union
 
 from typing_extensions import Self
 
-from .context import CollectContext
+from .context import CollectContext, WriterLock
 from .globals import COLLECTING_CONTEXT_VAR, GLOBAL_COLLECT_CONTEXT, GLOBAL_INSTANCE_CONTEXT, INSTANCE_CONTEXT_VAR
 from .typing import TYPE_CHECKING, P, R, TEntity
 
@@ -20,26 +21,57 @@ if TYPE_CHECKING:
 class scoped_collect(CollectContext):
     fn_implements: dict[FnRecordLabel, FnRecord]
     _tocollect_list: dict[FnImplementEntity, None]
+    _unbound: dict[FnImplementEntity, Callable]
     finalize_cbs: list[Callable[[scoped_collect], Any]]
     cls: type | None = None
+    origin: CollectContext | None = None
 
     def __init__(self) -> None:
         self.fn_implements = {}
+        self.plans = {}
+        self.proxies = weakref.WeakKeyDictionary()
+        self.restored = {}
+        self.lock = WriterLock()
         self.finalize_cbs = []
         self._tocollect_list = {}
+        self._unbound = {}
 
     @classmethod
     def globals(cls):
         instance = cls()
+        instance.origin = GLOBAL_COLLECT_CONTEXT
         instance.fn_implements = GLOBAL_COLLECT_CONTEXT.fn_implements
+        instance.weak = GLOBAL_COLLECT_CONTEXT.weak
+        instance.proxies = GLOBAL_COLLECT_CONTEXT.proxies
+        instance.restored = GLOBAL_COLLECT_CONTEXT.restored
+        instance.lock = GLOBAL_COLLECT_CONTEXT.lock
         return instance
 
     @classmethod
     def locals(cls):
         instance = cls()
-        instance.fn_implements = COLLECTING_CONTEXT_VAR.get().fn_implements
+        instance.origin = COLLECTING_CONTEXT_VAR.get()
+        instance.fn_implements = instance.origin.fn_implements
+        instance.weak = instance.origin.weak
+        instance.proxies = instance.origin.proxies
+        instance.restored = instance.origin.restored
+        instance.lock = instance.origin.lock
         return instance
 
+    @property
+    def frozen(self) -> bool:
+        return self.__dict__.get("frozen", False) or (self.origin is not None and self.origin.frozen)
+
+    @frozen.setter
+    def frozen(self, value: bool):
+        self.__dict__["frozen"] = value
+
+    def touch(self):
+        super().touch()
+
+        if self.origin is not None:
+            self.origin.touch()
+
     def finalize(self):
         for cb in self.finalize_cbs:
             cb(self)
@@ -47,6 +79,32 @@ class scoped_collect(CollectContext):
         for impl in self._tocollect_list:
             impl.collect(self)
 
+    def bind(self, instance: Any):
+        from .fn.selection import wrap_implement
+
+        for entity, func in self._unbound.items():
+            bound = func.__get__(instance, type(instance))
+            # weak and snapshot-restored contexts record a proxy rather than the function itself.
+            implement = self.slot_of(entity.impl)
+
+            for endpoint, _ in entity.targets:
+                record = self.fn_implements.get(endpoint.signature)
+                if record is not None and implement in record.implements:
+                    record.wrappers[implement] = wrap_implement(endpoint, bound)
+
+        self.touch()
+
+    def unbind(self):
+        for entity in self._unbound:
+            implement = self.slot_of(entity.impl)
+
+            for endpoint, _ in entity.targets:
+                record = self.fn_implements.get(endpoint.signature)
+                if record is not None:
+                    record.wrappers.pop(implement, None)
+
+        self.touch()
+
     def on_collected(self, func: Callable[[scoped_collect], Any]):
         self.finalize_cbs.append(func)
         return func
@@ -66,13 +124,29 @@ class scoped_collect(CollectContext):
             def build_static(cls) -> Self:
                 return cls()
 
-            def __init_subclass__(cls, *, static: bool = False) -> None:
+            def __init_subclass__(cls, *, static: Union[bool, Literal["lazy"]] = False, bind: bool = False) -> None:
                 self.cls = cls
                 self.finalize()
 
-                if static:
+                if static == "lazy":
+                    GLOBAL_INSTANCE_CONTEXT.provide(cls, cls.build_static)
+                elif static:
                     GLOBAL_INSTANCE_CONTEXT.instances[cls] = cls.build_static()
 
+                if bind:
+                    cls.bind()
+
+            @classmethod
+            def bind(cls, instance: Any = None):
+                if instance is None:
+                    instance = INSTANCE_CONTEXT_VAR.get().lookup(cls)
+
+                self.bind(instance)
+
+            @staticmethod
+            def unbind():
+                self.unbind()
+
             @staticmethod
             def collect(entity: TEntity) -> TEntity:  # type: ignore
                 return entity.collect(self)
@@ -83,7 +157,7 @@ class scoped_collect(CollectContext):
                 def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
                     assert self.cls is not None
 
-                    instance = INSTANCE_CONTEXT_VAR.get().instances[self.cls]
+                    instance = INSTANCE_CONTEXT_VAR.get().lookup(self.cls)
                     return func(instance, *args, **kwargs)
 
                 return wrapper
@@ -94,7 +168,9 @@ class scoped_collect(CollectContext):
                     entity: Callable[Concatenate[Any, P], R] | FnImplementEntity[Callable[P, R]],
                 ) -> FnImplementEntity[Callable[P, R]]:
                     if not isinstance(entity, FnImplementEntity):
-                        entity = target(LocalEndpoint.ensure_self(entity))
+                        func = entity
+                        entity = target(LocalEndpoint.ensure_self(func))
+                        self._unbound[entity] = func
                     else:
                         target(entity)
 
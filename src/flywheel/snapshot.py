@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+import importlib.util
+import io
+import os
+import pickle
+import sys
+from typing import TYPE_CHECKING, Any, Callable
+
+from .context import CollectContext
+from .fn.endpoint import FnCollectEndpoint
+from .fn.implement import FnImplementEntity, WeakImplement
+from .fn.record import FnRecord
+from .globals import invalidate_plans
+
+if TYPE_CHECKING:
+    from .fn.overload import FnOverload
+
+SNAPSHOT_MAGIC = b"FLYWHEEL-SNAPSHOT\x00"
+SNAPSHOT_VERSION = 1
+
+
+def _walk(path: str) -> Any:
+    module_name, _, qualname = path.partition(":")
+    target: Any = importlib.import_module(module_name)
+
+    for part in qualname.split("."):
+        target = getattr(target, "__dict__", {}).get(part, None) or getattr(target, part)
+
+    return target
+
+
+def _path_of(obj: Any) -> str:
+    obj = getattr(obj, "__func__", obj)
+    module, qualname = getattr(obj, "__module__", None), getattr(obj, "__qualname__", None)
+
+    if module is None or qualname is None or "<" in qualname:
+        raise ValueError(f"{obj!r} cannot be referenced by import path")
+
+    return f"{module}:{qualname}"
+
+
+def _source_hash(module_name: str) -> str | None:
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+
+    if spec is None or spec.origin is None or not os.path.isfile(spec.origin):
+        return None
+
+    with open(spec.origin, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class LazyImplement:
+    __slots__ = ("path", "target")
+
+    path: str
+    target: Callable | None
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.target = None
+
+    def resolve(self) -> Callable:
+        if self.target is None:
+            target = _walk(self.path)
+            self.target = target.impl if isinstance(target, FnImplementEntity) else target
+
+        return self.target
+
+    def __call__(self, *args, **kwargs):
+        return (self.target or self.resolve())(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        return f"<LazyImplement {self.path}>"
+
+
+def _implement_path(implement: Callable) -> str:
+    if isinstance(implement, LazyImplement):
+        return implement.path
+
+    if isinstance(implement, WeakImplement):
+        implement = implement.ref()
+
+    path = _path_of(implement)
+    resolved = _walk(path)
+
+    if resolved is not implement and not (isinstance(resolved, FnImplementEntity) and resolved.impl is implement):
+        raise ValueError(f"{implement!r} is not reachable through its import path {path!r}")
+
+    return path
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def __init__(self, file, modules: set[str]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.modules = modules
+
+    def persistent_id(self, obj: Any):
+        if isinstance(obj, FnCollectEndpoint):
+            self.modules.add(obj.qualname.partition(":")[0])
+            return ("endpoint", obj.qualname)
+
+        if isinstance(obj, LazyImplement) or (callable(obj) and not isinstance(obj, type) and hasattr(obj, "__code__")):
+            path = _implement_path(obj)
+            self.modules.add(path.partition(":")[0])
+            return ("implement", path)
+
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file):
+        super().__init__(file)
+        self.implements: dict[str, LazyImplement] = {}
+
+    def persistent_load(self, pid: Any):
+        kind, path = pid
+
+        if kind == "endpoint":
+            target = _walk(path)
+            if isinstance(target, staticmethod):
+                target = target.__func__
+
+            if isinstance(target, FnCollectEndpoint):
+                return target
+
+            if isinstance(getattr(target, "endpoint", None), FnCollectEndpoint):
+                return target.endpoint
+
+            return FnCollectEndpoint(target)
+
+        if kind == "implement":
+            # an already imported module has collected its implementations, so reference those instead of a proxy.
+            if path.partition(":")[0] in sys.modules:
+                return LazyImplement(path).resolve()
+
+            if path not in self.implements:
+                self.implements[path] = LazyImplement(path)
+
+            return self.implements[path]
+
+        raise pickle.UnpicklingError(f"unknown persistent id {pid!r}")
+
+
+def dump(context: CollectContext, path: str | os.PathLike[str]):
+    records = []
+
+    for label, record in context.fn_implements.items():
+        scopes: dict[str, tuple[FnOverload, list[tuple[Any, Callable]]]] = {}
+
+        for implement in record.order:
+            for name, signature in record.signatures.get(implement, ()):
+                if name not in scopes:
+                    scopes[name] = (record.overloads[name], [])
+
+                scopes[name][1].append((signature, implement))
+
+        records.append((label.endpoint, [implement for implement in record.order if implement is not None], scopes))
+
+    modules: set[str] = set()
+    buffer = io.BytesIO()
+    _SnapshotPickler(buffer, modules).dump(records)
+
+    sources = {module: _source_hash(module) for module in sorted(modules)}
+    payload = pickle.dumps((SNAPSHOT_VERSION, sources), protocol=pickle.HIGHEST_PROTOCOL)
+
+    with open(path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(len(payload).to_bytes(8, "little"))
+        f.write(payload)
+        f.write(buffer.getvalue())
+
+
+def load(path: str | os.PathLike[str], context: CollectContext | None = None) -> CollectContext | None:
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                return None
+
+            version, sources = pickle.loads(f.read(int.from_bytes(f.read(8), "little")))
+            if version != SNAPSHOT_VERSION:
+                return None
+
+            if any(_source_hash(module) != digest for module, digest in sources.items()):
+                return None
+
+            records = _SnapshotUnpickler(f).load()
+    except (OSError, EOFError, pickle.UnpicklingError, ImportError, AttributeError):
+        return None
+
+    if context is None:
+        context = CollectContext()
+
+    def local(implement: Callable) -> Callable:
+        # implementations that are already imported go through the context, so weak contexts keep using their proxies.
+        return implement if isinstance(implement, LazyImplement) else context.implement_of(implement)
+
+    with context.lock:
+        for endpoint, order, scopes in records:
+            label = endpoint.signature
+            record = context.fn_implements.get(label)
+            created = record is None
+
+            if created:
+                record = FnRecord()
+
+            order = [local(implement) for implement in order]
+            for implement in order:
+                if isinstance(implement, LazyImplement):
+                    context.restored[implement.path] = implement
+
+                record.reserve(implement)
+
+            if created:
+                context.fn_implements[label] = record
+                invalidate_plans(endpoint)
+
+            for name, (overload, items) in scopes.items():
+                overload.place_many(record, [(signature, local(implement)) for signature, implement in items], name=name)
+
+            for implement in order:
+                record.publish(implement)
+
+        context.touch()
+
+    return context
+
+
+def warm_start(path: str | os.PathLike[str], build: Callable[[], CollectContext]) -> CollectContext:
+    context = load(path)
+
+    if context is None:
+        context = build()
+        dump(context, path)
+
+    return context
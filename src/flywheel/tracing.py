@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from .globals import CALLER_TOKENS
+from .probes import DispatchProbe, attach, detach
+
+if TYPE_CHECKING:
+    from .fn.endpoint import FnCollectEndpoint
+    from .fn.overload import FnOverload
+
+
+class TraceEvent(NamedTuple):
+    kind: str
+    name: str
+    start: int
+    end: int
+    thread: int
+    stack: tuple[str, ...]
+    args: dict[str, Any]
+
+
+def _callers() -> tuple[str, ...]:
+    stack = []
+    token = CALLER_TOKENS.get()
+
+    while token is not None:
+        stack.append(token.endpoint.qualname)
+        token = token.parent
+
+    return tuple(reversed(stack))
+
+
+def _name_of(implement: Callable) -> str:
+    implement = getattr(implement, "__func__", implement)
+    qualname = getattr(implement, "__qualname__", None)
+    if qualname is None:
+        return repr(implement)
+
+    return f"{getattr(implement, '__module__', '?')}:{qualname}"
+
+
+class TraceRecorder(DispatchProbe):
+    events: list[TraceEvent]
+    dropped: int
+
+    def __init__(self, *, sample: float = 1.0, limit: int | None = None) -> None:
+        if not 0.0 < sample <= 1.0:
+            raise ValueError("sample must be in (0, 1]")
+
+        self.sample = sample
+        self.limit = limit
+        self.events = []
+        self.dropped = 0
+        self._random = random.Random()
+        # (sampled, settled) for the current top-level dispatch; settled once its lookup has finished.
+        self._decision: ContextVar[tuple[bool, bool] | None] = ContextVar(f"flywheel.tracing.{id(self)}", default=None)
+
+    def _sampled(self, kind: str) -> bool:
+        # decided once per top-level dispatch and inherited by the dispatches it makes, so sampled call trees stay whole.
+        state = self._decision.get()
+
+        if CALLER_TOKENS.get() is not None:
+            if state is None:
+                state = (self._random.random() < self.sample, True)
+                self._decision.set(state)
+
+            return state[0]
+
+        if kind == "call":
+            self._decision.set(None)
+            return state[0] if state is not None else self._random.random() < self.sample
+
+        if state is None or (state[1] and kind != "miss"):
+            state = (self._random.random() < self.sample, False)
+
+        self._decision.set((state[0], state[1] or kind == "select"))
+        return state[0]
+
+    def _record(self, kind: str, name: str, start: int, end: int, args: dict[str, Any]):
+        if self.sample < 1.0 and not self._sampled(kind):
+            return
+
+        if self.limit is not None and len(self.events) >= self.limit:
+            self.dropped += 1
+            return
+
+        stack = _callers()
+        args["depth"] = len(stack)
+        self.events.append(TraceEvent(kind, name, start, end, threading.get_ident(), stack, args))
+
+    def lookup(self, endpoint: FnCollectEndpoint, layers: int, completed: bool, start: int, end: int):
+        self._record("select", endpoint.qualname, start, end, {"layers": layers, "completed": completed})
+
+    def layer(self, endpoint: FnCollectEndpoint, layer_index: int, start: int, end: int):
+        self._record("layer", endpoint.qualname, start, end, {"layer": layer_index})
+
+    def harvest(self, endpoint: FnCollectEndpoint, overload: FnOverload, layer_index: int, empty: bool, start: int, end: int):
+        self._record("harvest", endpoint.qualname, start, end, {"overload": overload.name, "layer": layer_index, "empty": empty})
+
+    def call(self, endpoint: FnCollectEndpoint, implement: Callable, start: int, end: int):
+        self._record("call", endpoint.qualname, start, end, {"implement": _name_of(implement)})
+
+    def miss(self, endpoint: FnCollectEndpoint):
+        now = perf_counter_ns()
+        self._record("miss", endpoint.qualname, now, now, {})
+
+    def chrome_trace(self) -> dict[str, Any]:
+        pid = os.getpid()
+        trace_events = []
+
+        for event in self.events:
+            entry = {
+                "name": event.name if event.kind == "call" else f"{event.kind} {event.name}",
+                "cat": event.kind,
+                "ph": "X",
+                "ts": event.start / 1000,
+                "dur": (event.end - event.start) / 1000,
+                "pid": pid,
+                "tid": event.thread,
+                "args": event.args,
+            }
+
+            if event.kind == "miss":
+                entry["ph"] = "i"
+                entry["s"] = "t"
+                del entry["dur"]
+
+            trace_events.append(entry)
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ns", "otherData": {"dropped": self.dropped}}
+
+    def collapsed(self) -> str:
+        inclusive: dict[tuple[str, ...], int] = {}
+
+        for event in self.events:
+            if event.kind == "call":
+                stack = (*event.stack, event.name)
+                inclusive[stack] = inclusive.get(stack, 0) + event.end - event.start
+
+        exclusive = dict(inclusive)
+        for stack, elapsed in inclusive.items():
+            if stack[:-1] in exclusive:
+                exclusive[stack[:-1]] -= elapsed
+
+        return "".join(f"{';'.join(stack)} {max(elapsed, 0)}\n" for stack, elapsed in sorted(exclusive.items()))
+
+    def save_chrome_trace(self, path: str | os.PathLike[str]):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def save_collapsed(self, path: str | os.PathLike[str]):
+        with open(path, "w") as f:
+            f.write(self.collapsed())
+
+
+@contextmanager
+def trace(*, sample: float = 1.0, limit: int | None = None):
+    recorder = TraceRecorder(sample=sample, limit=limit)
+    attach(recorder)
+
+    try:
+        yield recorder
+    finally:
+        detach(recorder)
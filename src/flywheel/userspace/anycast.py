@@ -1,34 +1,91 @@
 from __future__ import annotations
 
-from typing import Callable, Generic
+from typing import TYPE_CHECKING, Any, Callable, Generic, Tuple
 
 from flywheel.overloads import SimpleOverload
 
+from ..context import CollectContext
 from ..fn.endpoint import FnCollectEndpoint
+from ..globals import CALLER_TOKENS, LOOKUP_LAYOUT_VAR, caller_index
+from ..probes import PROBES
 from ..typing import CR, P, R
 
+if TYPE_CHECKING:
+    from ..fn.endpoint import CollectEndpointTarget
+
 ANYCAST_OVERLOAD = SimpleOverload("flywheel.userspace.anycast")
 
+
+def _anycast_target(prototype: Callable) -> Callable[[], CollectEndpointTarget]:
+    # one target per Anycast: endpoints compare by target, so a shared one would merge every Anycast into a single record.
+    def target():
+        yield ANYCAST_OVERLOAD.hold(None)
+
+    # named after the prototype, so snapshots and probes refer to the Anycast rather than this factory.
+    target.__module__ = getattr(prototype, "__module__", target.__module__)
+    target.__qualname__ = getattr(prototype, "__qualname__", target.__qualname__)
+    return target
+
+
 class Anycast(Generic[CR]):
     endpoint: FnCollectEndpoint[[], CR]
     prototype: CR
-    
+    resolved: Tuple[Tuple[CollectContext, ...], int, CR] | None
+
     def __init__(self, prototype: CR):
-        self.endpoint = FnCollectEndpoint(self._prototype_collect)
+        self.endpoint = FnCollectEndpoint(_anycast_target(prototype))
         self.prototype = prototype
-    
-    @staticmethod
-    def _prototype_collect():
-        yield ANYCAST_OVERLOAD.hold(None)
+        self.resolved = None
+
+    def _lookup(self) -> CR:
+        for selection in self.endpoint.select(False):
+            if selection.harvest(ANYCAST_OVERLOAD, None):
+                selection.complete()
+                return next(iter(selection))
+
+        return self.prototype
+
+    def resolve(self) -> CR:
+        # inside one of our own overrides the answer depends on the caller's layer, so it is never cached.
+        if CALLER_TOKENS.get() is not None and caller_index(self.endpoint) >= 0:
+            return self._lookup()
+
+        layout = LOOKUP_LAYOUT_VAR.get()
+        clock = CollectContext.clock
+
+        resolved = self.resolved
+        if resolved is not None and resolved[0] is layout and resolved[1] == clock:
+            return resolved[2]
+
+        # read the clock before looking up, so a registration racing with us leaves the entry stale rather than wrong.
+        implement = self._lookup()
+        self.resolved = (layout, clock, implement)
+        return implement
 
     def __call__(self: Anycast[Callable[P, R]], *args: P.args, **kwargs: P.kwargs) -> R:
+        resolved = self.resolved
+        if (
+            resolved is not None
+            and resolved[0] is LOOKUP_LAYOUT_VAR.get()
+            and resolved[1] == CollectContext.clock
+            and CALLER_TOKENS.get() is None
+            and not PROBES
+        ):
+            return resolved[2](*args, **kwargs)
+
+        if PROBES:
+            return self._dispatch(args, kwargs)
+
+        return self.resolve()(*args, **kwargs)
+
+    def _dispatch(self, args: tuple, kwargs: dict[str, Any]):
         for selection in self.endpoint.select(False):
             if selection.harvest(ANYCAST_OVERLOAD, None):
                 selection.complete()
                 break
         else:
-            return self.prototype(*args, **kwargs)
-        
+            return self.prototype(*args, **kwargs)  # type: ignore
+
         return selection(*args, **kwargs)
 
     @property
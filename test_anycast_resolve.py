@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from flywheel import CollectContext, wrap_anycast
+
+
+@wrap_anycast
+def greet(name: str) -> str:
+    return f"hello {name}"
+
+
+@wrap_anycast
+def other(name: str) -> str:
+    return name
+
+
+def test_resolve():
+    outer, inner = CollectContext(), CollectContext()
+    outer.collect(greet.override(lambda name: f"outer {greet(name)}"))
+    inner.collect(greet.override(lambda name: f"inner {greet(name)}"))
+
+    assert greet.resolve() is greet.prototype
+
+    with outer.lookup_scope():
+        assert greet("a") == "outer hello a"
+        # overriding one anycast leaves the others alone.
+        assert other("a") == "a"
+
+        with inner.lookup_scope():
+            assert greet("a") == "inner outer hello a"
+
+            resolved = greet.resolve()
+            assert resolved("b") == "inner outer hello b"
+            assert greet.resolve() is resolved
+
+    assert greet("a") == "hello a"
+
+    spare = CollectContext()
+    with spare.lookup_scope():
+        assert greet("a") == "hello a"
+
+        # a new registration moves the clock on, so the cached resolution is not served again.
+        entity = spare.collect(greet.override(lambda name: f"newer {name}"))
+        assert greet("a") == "newer a"
+
+        spare.discard(entity)
+        assert greet("a") == "hello a"
+
+
+if __name__ == "__main__":
+    test_resolve()
+    print("ok")
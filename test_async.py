@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload
+
+key = SimpleOverload("key")
+
+
+def target(value: str):
+    yield key.hold(value)
+
+
+endpoint = FnCollectEndpoint(target)
+context = CollectContext()
+
+
+@context.collect
+@endpoint("x")
+async def slow(value: str):
+    await asyncio.sleep(0.02)
+    return "slow"
+
+
+@context.collect
+@endpoint("x")
+def fast(value: str):
+    return "fast"
+
+
+def select(value: str):
+    for selection in endpoint.select():
+        if selection.harvest(key, value):
+            selection.complete()
+
+    return selection  # type: ignore
+
+
+async def dispatch():
+    with context.lookup_scope():
+        selection = select("x")
+
+        first = await selection.call("x")
+        gathered = await selection.gather("x")
+        completed = [result async for result in selection.as_completed("x")]
+
+        running = 0
+        peak = 0
+
+        async def tracked(value: str):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        local = CollectContext()
+        for _ in range(4):
+            local.collect(endpoint("y")(lambda value: tracked(value)))
+
+        with local.lookup_scope():
+            await select("y").gather("y", concurrency=2)
+
+    return first, gathered, completed, peak
+
+
+def test_async_dispatch():
+    first, gathered, completed, peak = asyncio.run(dispatch())
+
+    assert first == "slow"
+    # gather keeps registration order; as_completed yields in completion order.
+    assert gathered == ["slow", "fast"]
+    assert completed == ["fast", "slow"]
+    assert peak == 2
+
+
+if __name__ == "__main__":
+    test_async_dispatch()
+    print("ok")
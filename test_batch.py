@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pytest
+
+from flywheel import BatchSelection, CollectContext, FnCollectEndpoint, SimpleOverload, TypeOverload, batched
+
+kind = TypeOverload("kind")
+key = SimpleOverload("key")
+
+
+def by_type(value: type):
+    yield kind.hold(value)
+
+
+def by_key(value: int):
+    yield key.hold(value)
+
+
+typed = FnCollectEndpoint(by_type)
+keyed = FnCollectEndpoint(by_key)
+
+
+def test_select_many():
+    context = CollectContext()
+    calls = []
+
+    @batched
+    def evens(values):
+        calls.append(list(values))
+        return [f"even {value}" for value in values]
+
+    context.collect(keyed(0)(evens))
+    context.collect(keyed(1)(lambda value: f"odd {value}"))
+
+    with context.lookup_scope():
+        batch = keyed.select_many(key, [0, 1, 0, 1, 0])
+        assert len(batch) == 2 and not batch.missing
+        assert batch() == ["even 0", "odd 1", "even 0", "odd 1", "even 0"]
+
+        # a batched implementation is called once with every value routed to it.
+        assert calls == [[0, 0, 0]]
+
+        batch = keyed.select_many(key, [0, 5])
+        assert batch.missing == [[1]]
+
+        try:
+            batch()
+        except NotImplementedError:
+            pass
+        else:
+            raise AssertionError("a batch with missing values was called")
+
+
+def test_ndarray_scalars():
+    np = pytest.importorskip("numpy")
+    context = CollectContext()
+    context.collect(typed(np.int64)(lambda value: ("numpy", int(value))))
+    context.collect(typed(int)(lambda value: ("python", value)))
+
+    values = np.array([3, 1, 3, 2], dtype=np.int64)
+    with context.lookup_scope():
+        batch = BatchSelection.build(typed, kind, values)
+
+        # every value shares a cache key, so the whole array resolves once, to the numpy implementation.
+        assert len(batch) == 1
+        assert batch().tolist() == [("numpy", 3), ("numpy", 1), ("numpy", 3), ("numpy", 2)]
+
+
+def test_ndarray_groups():
+    np = pytest.importorskip("numpy")
+    context = CollectContext()
+    context.collect(keyed(1)(lambda value: "one"))
+    context.collect(keyed(2)(lambda value: "two"))
+
+    values = np.array([[1, 2], [2, 1]])
+    with context.lookup_scope():
+        batch = BatchSelection.build(keyed, key, values)
+
+        assert len(batch) == 2 and not batch.missing
+        assert batch().tolist() == [["one", "two"], ["two", "one"]]
+
+
+if __name__ == "__main__":
+    test_select_many()
+    test_ndarray_scalars()
+    test_ndarray_groups()
+    print("ok")
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from flywheel import CollectContext, FnCollectEndpoint, HarvestCache, SimpleOverload
+
+key = SimpleOverload("key")
+
+
+def target(value: int):
+    yield key.hold(value)
+
+
+endpoint = FnCollectEndpoint(target)
+
+
+def call(value: int, cache: HarvestCache):
+    for selection in endpoint.select(cache=cache):
+        if selection.harvest(key, value):
+            selection.complete()
+
+    return selection()  # type: ignore
+
+
+def test_harvest_cache():
+    context = CollectContext()
+    context.collect(endpoint(1)(lambda: "one"))
+    cache = HarvestCache(maxsize=2)
+
+    with context.lookup_scope():
+        assert call(1, cache) == call(1, cache) == "one"
+        assert cache.info()[:2] == (1, 1)
+
+        # a collect bumps the record version, so the cached entry is not served again.
+        context.collect(endpoint(1)(lambda: "again"))
+        assert call(1, cache) == "one"
+        assert cache.info().misses == 2
+
+        context.collect(endpoint(2)(lambda: "two"))
+        context.collect(endpoint(3)(lambda: "three"))
+        for value in (1, 2, 3):
+            call(value, cache)
+
+        info = cache.info()
+        assert info.currsize == 2 and info.evictions == 1
+
+
+if __name__ == "__main__":
+    test_harvest_cache()
+    print("ok")
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload
+
+key = SimpleOverload("key")
+runs = []
+
+
+def target(value: int):
+    runs.append(value)
+    yield key.hold(value)
+
+
+endpoint = FnCollectEndpoint(target)
+
+
+def names(context: CollectContext, value: int) -> list[str]:
+    with context.lookup_scope():
+        for selection in endpoint.select(False):
+            if selection.harvest(key, value):
+                selection.complete()
+                return [implement() for implement in selection]
+
+    return []
+
+
+def test_replay():
+    runs.clear()
+    entity = endpoint(1)(lambda: "one")
+    first, second = CollectContext(), CollectContext()
+
+    first.collect(entity)
+    second.collect(entity)
+
+    # the signals are materialised once and replayed into every later context.
+    assert runs == [1]
+    assert names(first, 1) == names(second, 1) == ["one"]
+
+
+def test_collect_many():
+    entities = [endpoint(value % 3)(lambda value=value: f"v{value}") for value in range(9)]
+    one, bulk = CollectContext(), CollectContext()
+
+    for entity in entities:
+        one.collect(entity)
+
+    assert bulk.collect_many(entities) == entities
+
+    for value in range(3):
+        assert names(bulk, value) == names(one, value) == [f"v{i}" for i in range(value, 9, 3)]
+
+
+if __name__ == "__main__":
+    test_replay()
+    test_collect_many()
+    print("ok")
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import gc
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload
+from flywheel.fn.record import COMPACT_THRESHOLD
+from flywheel.scoped import scoped_collect
+
+key = SimpleOverload("key")
+
+
+def target(value: int):
+    yield key.hold(value)
+
+
+endpoint = FnCollectEndpoint(target)
+
+
+def call(value: int):
+    for selection in endpoint.select():
+        if not selection.harvest(key, value):
+            continue
+
+        selection.complete()
+
+    return selection()  # type: ignore
+
+
+def test_discard():
+    context = CollectContext()
+    entity = context.collect(endpoint(1)(lambda: 1))
+    context.collect(endpoint(2)(lambda: 2))
+
+    with context.lookup_scope():
+        assert call(1) == 1
+        assert context.discard(entity)
+        assert not context.discard(entity)
+
+        try:
+            call(1)
+        except NotImplementedError:
+            pass
+        else:
+            raise AssertionError("discarded implementation is still selected")
+
+        assert call(2) == 2
+
+
+def test_weak():
+    context = CollectContext(weak=True)
+
+    def implement():
+        return 1
+
+    context.collect(endpoint(1)(implement))
+
+    with context.lookup_scope():
+        assert call(1) == 1
+
+        del implement
+        gc.collect()
+
+        try:
+            call(1)
+        except NotImplementedError:
+            pass
+        else:
+            raise AssertionError("collected implementation is still selected")
+
+
+def test_weak_bind():
+    context = CollectContext(weak=True)
+
+    with context.collect_scope():
+
+        class Handler(m := scoped_collect.locals().target):
+            @m.impl(endpoint(1))
+            def handle(self):
+                return self
+
+    record = context.fn_implements[endpoint.signature]
+    handler = Handler()
+
+    # the record holds a weak proxy, so bind and unbind must address the proxy's slot.
+    with context.lookup_scope():
+        Handler.bind(handler)
+        assert len(record.wrappers) == 1
+        assert call(1) is handler
+
+        Handler.unbind()
+        assert not record.wrappers
+
+
+def test_compact():
+    context = CollectContext()
+    context.collect(endpoint(0)(lambda: 0))
+
+    for value in range(1, COMPACT_THRESHOLD * 4):
+        context.discard(context.collect(endpoint(value)(lambda value=value: value)))
+
+    record = context.fn_implements[endpoint.signature]
+    assert len(record.order) < COMPACT_THRESHOLD * 2, len(record.order)
+
+    with context.lookup_scope():
+        assert call(0) == 0
+
+
+if __name__ == "__main__":
+    test_discard()
+    test_weak()
+    test_weak_bind()
+    test_compact()
+    print("ok")
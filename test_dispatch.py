@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload, metrics
+
+left = SimpleOverload("left")
+right = SimpleOverload("right")
+
+
+def target(a: str | None = None, b: str | None = None):
+    if a is not None:
+        yield left.hold(a)
+
+    if b is not None:
+        yield right.hold(b)
+
+
+endpoint = FnCollectEndpoint(target)
+
+
+def fallback(a=None, b=None):
+    return "default"
+
+
+def missed(dispatcher, *args) -> bool:
+    try:
+        dispatcher(*args)
+    except NotImplementedError:
+        return True
+
+    return False
+
+
+def check(context: CollectContext):
+    single = endpoint.dispatch(left=0)
+    single_default = endpoint.dispatch(left=0, default=fallback)
+    both = endpoint.dispatch(left=0, right=1)
+    both_default = endpoint.dispatch(left=0, right=1, default=fallback)
+    routed = endpoint.dispatch(right=1)
+    routed_default = endpoint.dispatch(right=1, default=fallback)
+
+    with context.lookup_scope():
+        assert single("x") == both("x", "y") == "xy"
+        assert both("z", "w") == "zw"
+
+        # nothing laid under the value.
+        assert missed(single, "q")
+        assert single_default("q") == "default"
+
+        # each value matches, but no implementation was laid under both.
+        assert missed(both, "x", "w")
+        assert both_default("x", "w") == "default"
+
+    partial = CollectContext()
+    partial.collect(endpoint("x")(lambda a=None, b=None: "x"))
+
+    with partial.lookup_scope():
+        # the record holds no scope for the routed overload at all.
+        assert missed(routed, None, "y")
+        assert routed_default(None, "y") == "default"
+
+    with CollectContext().lookup_scope():
+        assert missed(single, "x")
+        assert single_default("x") == "default"
+
+
+def test_dispatch():
+    context = CollectContext()
+    context.collect(endpoint("x", "y")(lambda a=None, b=None: "xy"))
+    context.collect(endpoint("z", "w")(lambda a=None, b=None: "zw"))
+
+    # once plain, once through the probed path metrics switch on.
+    check(context)
+
+    metrics.enable()
+    try:
+        check(context)
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+
+if __name__ == "__main__":
+    test_dispatch()
+    print("ok")
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from contextlib import ExitStack
+
+from flywheel import InstanceContext, InstanceOf
+from flywheel.globals import INSTANCE_CONTEXT_VAR
+
+
+class A:
+    pass
+
+
+class B:
+    pass
+
+
+class User:
+    a = InstanceOf(A)
+    b = InstanceOf(B)
+
+
+def test_nested_scopes():
+    a1, a2, b1 = A(), A(), B()
+    user = User()
+    outer = InstanceContext()
+    outer.store(a1)
+
+    with outer.scope():
+        assert user.a is a1
+
+        inner = InstanceContext()
+        inner.store(a2, b1)
+
+        with inner.scope():
+            assert user.a is a2 and user.b is b1
+
+            # a write to a base reaches every scope built on top of it.
+            inner.instances[A] = a1
+            assert user.a is a1
+
+        try:
+            user.b
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("B leaked out of the inner scope")
+
+    with ExitStack() as stack:
+        for _ in range(16):
+            stack.enter_context(outer.scope())
+
+        assert user.a is a1
+
+
+def test_instances_view():
+    root = InstanceContext()
+    root.instances[str] = "root"
+
+    with root.scope():
+        leaf = INSTANCE_CONTEXT_VAR.get()
+        assert leaf.instances[str] == "root"
+        assert dict(leaf.instances)[str] == "root"
+
+        leaf.instances[int] = 1
+        assert int not in root.instances
+
+        root.instances[float] = 1.5
+        assert leaf.instances[float] == 1.5
+
+        # like a ChainMap, only the scope's own layer can be deleted from.
+        try:
+            del leaf.instances[str]
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("deleted an inherited instance")
+
+        root.provide(bytes, lambda: b"x")
+        assert leaf.instances[bytes] == b"x" and bytes in leaf.instances
+
+        # writes to an unrelated context leave this scope's flattened cache in place.
+        leaf.resolve()
+        InstanceContext().instances[int] = 2
+        assert leaf.resolved_at == leaf.generation
+
+
+if __name__ == "__main__":
+    test_nested_scopes()
+    test_instances_view()
+    print("ok")
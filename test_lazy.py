@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload
+from flywheel.globals import GLOBAL_COLLECT_CONTEXT
+from flywheel.lazy import LAZY_PROVIDERS, provide
+
+key = SimpleOverload("key")
+
+
+def target(value: str):
+    yield key.hold(value)
+
+
+endpoint = FnCollectEndpoint(target)
+
+BROKEN = "flywheel_lazy_broken"
+GOOD = "flywheel_lazy_good"
+
+SOURCES = {
+    BROKEN: """
+import os
+
+if not os.environ.get("FLYWHEEL_LAZY_FIXED"):
+    raise ImportError("provider is broken")
+""",
+    GOOD: f"""
+from flywheel.globals import global_collect
+
+from {__name__} import endpoint
+
+
+@global_collect
+@endpoint("x")
+def good():
+    return "good"
+""",
+}
+
+
+def call(value: str):
+    for selection in endpoint.select():
+        if selection.harvest(key, value):
+            selection.complete()
+
+    return selection()  # type: ignore
+
+
+def test_provide():
+    with tempfile.TemporaryDirectory() as directory:
+        for name, source in SOURCES.items():
+            with open(os.path.join(directory, f"{name}.py"), "w") as f:
+                f.write(source)
+
+        sys.path.insert(0, directory)
+        try:
+            provide(endpoint, BROKEN, GOOD)
+            assert GOOD not in sys.modules
+
+            with CollectContext().lookup_scope(), GLOBAL_COLLECT_CONTEXT.lookup_scope():
+                # a provider that fails to import stays queued together with the ones after it.
+                for _ in range(2):
+                    try:
+                        call("x")
+                    except (ImportError, NotImplementedError):
+                        pass
+                    else:
+                        raise AssertionError("broken provider did not raise")
+
+                    assert LAZY_PROVIDERS[endpoint.qualname] == [BROKEN, GOOD]
+
+                os.environ["FLYWHEEL_LAZY_FIXED"] = "1"
+                assert call("x") == "good"
+                assert endpoint.qualname not in LAZY_PROVIDERS
+        finally:
+            os.environ.pop("FLYWHEEL_LAZY_FIXED", None)
+            LAZY_PROVIDERS.pop(endpoint.qualname, None)
+            sys.path.remove(directory)
+            sys.modules.pop(BROKEN, None)
+            sys.modules.pop(GOOD, None)
+
+
+if __name__ == "__main__":
+    test_provide()
+    print("ok")
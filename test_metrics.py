@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload, metrics
+
+key = SimpleOverload("key")
+
+
+def target(value: int):
+    yield key.hold(value)
+
+
+endpoint = FnCollectEndpoint(target)
+context = CollectContext()
+context.collect(endpoint(1)(lambda value: value))
+
+
+def call(value: int):
+    for selection in endpoint.select():
+        if selection.harvest(key, value):
+            selection.complete()
+
+    return selection(value)  # type: ignore
+
+
+def test_metrics():
+    metrics.reset()
+    metrics.enable()
+
+    try:
+        with context.lookup_scope():
+            assert call(1) == 1
+
+            try:
+                call(2)
+            except NotImplementedError:
+                pass
+
+            dispatcher = endpoint.dispatch(key=0)
+            assert dispatcher(1) == 1
+    finally:
+        metrics.disable()
+
+    assert not metrics.enabled()
+    counts = metrics.snapshot()[endpoint.qualname]
+    assert counts["lookups"] == 3
+    assert counts["harvests"] == 3
+    assert counts["empty"] == 1
+    assert counts["calls"] == 2
+    assert counts["misses"] == 1
+    assert counts["latency"]["call"]["count"] == 2
+
+    # nothing is recorded while disabled.
+    with context.lookup_scope():
+        call(1)
+
+    assert metrics.snapshot()[endpoint.qualname]["calls"] == 2
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+if __name__ == "__main__":
+    test_metrics()
+    print("ok")
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from collections.abc import Sized
+from typing import Any
+
+from flywheel import CollectContext, FnCollectEndpoint, FnOverload, PathOverload, PrefixOverload, RangeOverload, TypeOverload
+
+
+def endpoint_of(overload: FnOverload) -> FnCollectEndpoint:
+    def target(value: Any):
+        yield overload.hold(value)
+
+    return FnCollectEndpoint(target)
+
+
+def names(endpoint: FnCollectEndpoint, overload: FnOverload, value: Any) -> list[str]:
+    for selection in endpoint.select(False):
+        if selection.harvest(overload, value):
+            selection.complete()
+            return [implement() for implement in selection]
+
+    return []
+
+
+def test_type_mro():
+    overload = TypeOverload("type", mro=True)
+    endpoint = endpoint_of(overload)
+    context = CollectContext()
+    context.collect(endpoint(int)(lambda: "int"))
+    context.collect(endpoint(object)(lambda: "object"))
+
+    with context.lookup_scope():
+        assert names(endpoint, overload, True) == ["int"]
+        assert names(endpoint, overload, "text") == ["object"]
+
+        # a closer registration replaces the resolution cached for bool.
+        context.collect(endpoint(bool)(lambda: "bool"))
+        assert names(endpoint, overload, True) == ["bool"]
+
+
+def test_type_abc():
+    overload = TypeOverload("type", abc=True)
+    endpoint = endpoint_of(overload)
+    context = CollectContext()
+    context.collect(endpoint(Sized)(lambda: "sized"))
+
+    with context.lookup_scope():
+        assert names(endpoint, overload, [1]) == ["sized"]
+        assert names(endpoint, overload, 1) == []
+
+    plain = TypeOverload("type")
+    endpoint = endpoint_of(plain)
+    context = CollectContext()
+    context.collect(endpoint(object)(lambda: "object"))
+
+    with context.lookup_scope():
+        assert names(endpoint, plain, 1) == []
+
+
+def test_type_frozen():
+    overload = TypeOverload("type", mro=True)
+    endpoint = endpoint_of(overload)
+    context = CollectContext()
+    context.collect(endpoint(int)(lambda: "int"))
+    context.collect(endpoint(object)(lambda: "object"))
+    context.freeze()
+
+    scope = context.fn_implements[endpoint.signature].scopes["type"]
+    table = dict(scope.resolved)
+    assert set(table) == {int, object}
+
+    with context.lookup_scope():
+        assert names(endpoint, overload, 1) == ["int"]
+        assert names(endpoint, overload, True) == ["int"]
+        assert names(endpoint, overload, "text") == ["object"]
+
+    # types the scope was not laid with are resolved per call, never written back.
+    assert dict(scope.resolved) == table
+
+    try:
+        context.collect(endpoint(bool)(lambda: "bool"))
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("collected into a frozen context")
+
+
+def test_range():
+    overload = RangeOverload("range")
+    endpoint = endpoint_of(overload)
+    context = CollectContext()
+    context.collect(endpoint((0, 10))(lambda: "low"))
+    context.collect(endpoint((5, 20))(lambda: "wide"))
+
+    with context.lookup_scope():
+        assert names(endpoint, overload, 0) == ["low"]
+        assert names(endpoint, overload, 7) == ["low", "wide"]
+        # ranges are half-open.
+        assert names(endpoint, overload, 10) == ["wide"]
+        assert names(endpoint, overload, 20) == []
+        assert names(endpoint, overload, -1) == []
+
+    try:
+        CollectContext().collect(endpoint((3, 3))(lambda: "empty"))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("empty range was accepted")
+
+
+def test_prefix():
+    overload = PrefixOverload("prefix")
+    endpoint = endpoint_of(overload)
+    context = CollectContext()
+    context.collect(endpoint("/")(lambda: "root"))
+    context.collect(endpoint("/help")(lambda: "help"))
+
+    with context.lookup_scope():
+        # the longest registered prefix wins.
+        assert names(endpoint, overload, "/help me") == ["help"]
+        assert names(endpoint, overload, "/he") == ["root"]
+        assert names(endpoint, overload, "help") == []
+
+    greedy = PrefixOverload("prefix", greed=True)
+    endpoint = endpoint_of(greedy)
+    context = CollectContext()
+    context.collect(endpoint("/")(lambda: "root"))
+    context.collect(endpoint("/help")(lambda: "help"))
+
+    with context.lookup_scope():
+        assert names(endpoint, greedy, "/help me") == ["root", "help"]
+
+
+def test_path():
+    overload = PathOverload("path")
+    endpoint = endpoint_of(overload)
+    context = CollectContext()
+    context.collect(endpoint("a.b")(lambda: "a.b"))
+
+    with context.lookup_scope():
+        assert names(endpoint, overload, "a.b.c") == ["a.b"]
+        # segments match whole, unlike plain prefixes.
+        assert names(endpoint, overload, "a.bc") == []
+
+
+if __name__ == "__main__":
+    test_type_mro()
+    test_type_abc()
+    test_type_frozen()
+    test_range()
+    test_prefix()
+    test_path()
+    print("ok")
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload
+from flywheel.globals import lookup_plan, union_scope
+
+key = SimpleOverload("key")
+
+
+def target(value: int):
+    yield key.hold(value)
+
+
+endpoint = FnCollectEndpoint(target)
+
+
+def test_plan_invalidation():
+    inner, outer = CollectContext(), CollectContext()
+    outer.collect(endpoint(1)(lambda: "outer"))
+
+    with union_scope(inner, outer):
+        plan = lookup_plan(endpoint)
+        assert [index for index, _ in plan] == [1]
+        assert lookup_plan(endpoint) is plan
+
+        # the first record in a layer changes which layers the endpoint has to visit.
+        inner.collect(endpoint(1)(lambda: "inner"))
+        assert [index for index, _ in lookup_plan(endpoint)] == [0, 1]
+
+        for selection in endpoint.select():
+            if selection.harvest(key, 1):
+                selection.complete()
+
+        assert selection() == "inner"
+
+
+def test_deep_layout():
+    layers = [CollectContext() for _ in range(24)]
+    layers[5].collect(endpoint(1)(lambda: "fifth"))
+    layers[17].collect(endpoint(1)(lambda: "seventeenth"))
+
+    with union_scope(*layers):
+        # only the layers holding a record for the endpoint are visited.
+        assert [index for index, _ in lookup_plan(endpoint)] == [5, 17]
+
+        layers[9].collect(endpoint(1)(lambda: "ninth"))
+        assert [index for index, _ in lookup_plan(endpoint)] == [5, 9, 17]
+
+        for selection in endpoint.select():
+            if selection.harvest(key, 1):
+                selection.complete()
+
+        assert selection() == "fifth"
+
+
+class PausingRecords(dict):
+    # holds the first reader right after it checked for the record, so a writer can add it in between.
+    def __init__(self):
+        super().__init__()
+        self.checked = threading.Event()
+        self.resume = threading.Event()
+
+    def __contains__(self, label):
+        found = super().__contains__(label)
+
+        if not self.checked.is_set():
+            self.checked.set()
+            self.resume.wait(5)
+
+        return found
+
+
+def test_first_collect_during_lookup():
+    context = CollectContext()
+    context.fn_implements = PausingRecords()
+    results = []
+
+    def reader():
+        with context.lookup_scope():
+            for selection in endpoint.select(False):
+                if selection.harvest(key, 1):
+                    selection.complete()
+                    results.append(selection())
+                    break
+            else:
+                results.append(None)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+
+    assert context.fn_implements.checked.wait(5)
+    context.collect(endpoint(1)(lambda: 1))
+    context.fn_implements.resume.set()
+    thread.join()
+
+    assert results == [1], results
+
+    # the plan cached for this layout must see the record as well.
+    with context.lookup_scope():
+        for selection in endpoint.select():
+            if selection.harvest(key, 1):
+                selection.complete()
+
+        assert selection() == 1
+
+
+if __name__ == "__main__":
+    test_plan_invalidation()
+    test_deep_layout()
+    test_first_collect_during_lookup()
+    print("ok")
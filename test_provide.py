@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import itertools
+
+from flywheel import InstanceContext, InstanceOf
+
+
+class Session:
+    pass
+
+
+class Client:
+    session = InstanceOf(Session)
+
+
+def test_singleton():
+    context = InstanceContext()
+    counter = itertools.count(1)
+    provider = context.provide(Session, lambda: next(counter))
+
+    assert context.unused_providers() == [provider]
+
+    with context.scope():
+        first = Client().session
+
+    with context.scope():
+        assert Client().session == first == 1
+
+    assert provider.builds == 1 and not context.unused_providers()
+
+
+def test_scope_lifetime():
+    context = InstanceContext()
+    counter = itertools.count(1)
+    context.provide(Session, lambda: next(counter), lifetime="scope")
+
+    with context.scope():
+        first = Client().session
+        assert Client().session == first
+
+    with context.scope():
+        second = Client().session
+
+    assert first != second
+
+    # an instance built for the providing context itself must not leak into the scopes made from it.
+    with context.scope(inherit=False):
+        root = Client().session
+
+    with context.scope():
+        third = Client().session
+
+    with context.scope():
+        fourth = Client().session
+
+    assert len({first, second, root, third, fourth}) == 5
+
+
+def test_circular():
+    context = InstanceContext()
+    context.provide(Session, lambda: context.lookup(Session))
+
+    try:
+        context.lookup(Session)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("circular provider was not detected")
+
+
+if __name__ == "__main__":
+    test_singleton()
+    test_scope_lifetime()
+    test_circular()
+    print("ok")
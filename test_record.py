@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload
+
+key = SimpleOverload("key")
+
+
+def target(value: str):
+    yield key.hold(value)
+
+
+endpoint = FnCollectEndpoint(target)
+
+
+def test_slots():
+    context = CollectContext()
+    entity = context.collect(endpoint("a")(lambda: "a"))
+    label = endpoint.signature
+    record = context.fn_implements[label]
+
+    with context.lookup_scope():
+        candidates = endpoint.select()
+        for selection in candidates:
+            if selection.harvest(key, "a"):
+                selection.complete()
+
+        assert selection() == "a"  # type: ignore
+
+    # the core objects allocated per record and per call carry no instance __dict__.
+    for instance in (label, record, candidates, selection, *entity.targets[0][1]):  # type: ignore
+        assert not hasattr(instance, "__dict__"), instance
+
+    # spent collect generators are replaced by the signals they emitted.
+    assert isinstance(entity.targets[0][1], tuple)
+
+    assert repr(record).startswith("FnRecord(scopes={'key': ")
+
+
+if __name__ == "__main__":
+    test_slots()
+    print("ok")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload
+from flywheel.globals import GLOBAL_INSTANCE_CONTEXT
+from flywheel.scoped import scoped_collect
+
+key = SimpleOverload("key")
+
+
+def target(value: str):
+    yield key.hold(value)
+
+
+endpoint = FnCollectEndpoint(target)
+
+
+def call(value: str):
+    for selection in endpoint.select():
+        if selection.harvest(key, value):
+            selection.complete()
+
+    return selection()  # type: ignore
+
+
+def test_bind():
+    context = CollectContext()
+
+    with context.collect_scope():
+
+        class Handler(m := scoped_collect.locals().target, static=True, bind=True):
+            @m.impl(endpoint("a"))
+            def a(self):
+                return self
+
+    static = GLOBAL_INSTANCE_CONTEXT.instances[Handler]
+    record = context.fn_implements[endpoint.signature]
+
+    with context.lookup_scope():
+        # bound at class creation: the record serves the bound method instead of the per-call lookup.
+        assert call("a") is static
+        assert [wrapper.__wrapped__.__self__ for wrapper in record.wrappers.values()] == [static]
+
+        other = Handler()
+        Handler.bind(other)
+        assert call("a") is other
+
+        Handler.unbind()
+        assert not record.wrappers
+        assert call("a") is static
+
+
+if __name__ == "__main__":
+    test_bind()
+    print("ok")
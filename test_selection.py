@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload
+from flywheel.globals import CALLER_TOKENS, union_scope
+
+left = SimpleOverload("left")
+right = SimpleOverload("right")
+
+
+def target(a: str, b: str):
+    yield left.hold(a)
+    yield right.hold(b)
+
+
+endpoint = FnCollectEndpoint(target)
+
+
+def select(a: str, b: str):
+    for selection in endpoint.select():
+        if not selection.harvest(left, a):
+            continue
+
+        if not selection.harvest(right, b):
+            continue
+
+        selection.complete()
+
+    return selection  # type: ignore
+
+
+def test_intersection_order():
+    context = CollectContext()
+    names = ["first", "second", "third", "fourth"]
+
+    for name, (a, b) in zip(names, [("x", "y"), ("x", "z"), ("x", "y"), ("w", "y")]):
+        context.collect(endpoint(a, b)(lambda a, b, name=name: name))
+
+    with context.lookup_scope():
+        # only the implementations laid under both values survive, in the order they were collected.
+        assert [implement("x", "y") for implement in select("x", "y")] == ["first", "third"]
+        assert [implement("x", "z") for implement in select("x", "z")] == ["second"]
+
+
+def test_caller_layers():
+    inner, outer = CollectContext(), CollectContext()
+
+    # an implementation dispatching the same endpoint again continues from the layer after its own.
+    inner.collect(endpoint("x", "y")(lambda a, b: ["inner", *select(a, b)(a, b)]))
+    outer.collect(endpoint("x", "y")(lambda a, b: ["outer"]))
+
+    with union_scope(inner, outer):
+        assert select("x", "y")("x", "y") == ["inner", "outer"]
+        assert CALLER_TOKENS.get() is None
+
+        record = inner.fn_implements[endpoint.signature]
+        assert [wrapper for wrapper in select("x", "y")] == list(record.wrappers.values())
+
+
+if __name__ == "__main__":
+    test_intersection_order()
+    test_caller_layers()
+    print("ok")
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+
+from flywheel import CollectContext
+from flywheel.snapshot import LazyImplement, dump, load
+
+API = "flywheel_snapshot_api"
+MODULE = "flywheel_snapshot_handlers"
+
+SOURCES = {
+    API: """
+from flywheel import FnCollectEndpoint, SimpleOverload
+
+key = SimpleOverload("key")
+
+
+def target(value: str):
+    yield key.hold(value)
+
+
+endpoint = FnCollectEndpoint(target)
+
+
+def fan(value: str):
+    for selection in endpoint.select(False):
+        if selection.harvest(key, value):
+            selection.complete()
+            return [implement(value) for implement in selection]
+
+    return []
+""",
+    MODULE: """
+from flywheel.globals import local_collect
+from flywheel_snapshot_api import endpoint
+
+
+@local_collect
+@endpoint("a")
+def first(value: str):
+    return ("first", value)
+
+
+@local_collect
+@endpoint("a")
+def second(value: str):
+    return ("second", value)
+""",
+}
+
+
+def populated(context: CollectContext):
+    with context.collect_scope():
+        __import__(MODULE)
+
+
+def live(context: CollectContext) -> list:
+    return [implement for record in context.fn_implements.values() for implement in record.order if implement is not None]
+
+
+def test_snapshot():
+    with tempfile.TemporaryDirectory() as directory:
+        for name, source in SOURCES.items():
+            with open(os.path.join(directory, f"{name}.py"), "w") as f:
+                f.write(source)
+
+        sys.path.insert(0, directory)
+        try:
+            path = os.path.join(directory, "handlers.snap")
+            context = CollectContext()
+            populated(context)
+            dump(context, path)
+
+            # a fresh process: the snapshot is loaded before the module has been imported.
+            del sys.modules[MODULE]
+            restored = load(path)
+            assert restored is not None
+            assert all(isinstance(implement, LazyImplement) for implement in live(restored))
+
+            # importing the module runs its collect decorators into the restored context, which must not add a second copy.
+            populated(restored)
+            assert len(live(restored)) == 2
+
+            api = sys.modules[API]
+            with restored.lookup_scope():
+                assert api.fan("a") == [("first", "a"), ("second", "a")]
+
+            # loading over a context that already collected the module keeps one slot per implementation.
+            assert load(path, restored) is restored
+            assert len(live(restored)) == 2
+
+            # the re-imported function finds the slot its snapshot entry holds, so it can be discarded again.
+            assert restored.discard(sys.modules[MODULE].first)
+            assert len(live(restored)) == 1
+            with restored.lookup_scope():
+                assert api.fan("a") == [("second", "a")]
+        finally:
+            sys.path.remove(directory)
+            sys.modules.pop(MODULE, None)
+            sys.modules.pop(API, None)
+
+
+if __name__ == "__main__":
+    test_snapshot()
+    print("ok")
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import flywheel
+from flywheel import CollectContext, FnCollectEndpoint, SimpleOverload
+
+key = SimpleOverload("key")
+
+
+def outer(value: int):
+    yield key.hold(value)
+
+
+def inner(value: int):
+    yield key.hold(value)
+
+
+outer_endpoint = FnCollectEndpoint(outer)
+inner_endpoint = FnCollectEndpoint(inner)
+
+
+def call(endpoint: FnCollectEndpoint, value: int):
+    for selection in endpoint.select():
+        if selection.harvest(key, value):
+            selection.complete()
+
+    return selection(value)  # type: ignore
+
+
+context = CollectContext()
+context.collect(outer_endpoint(1)(lambda value: call(inner_endpoint, value) + 1))
+context.collect(inner_endpoint(1)(lambda value: value))
+
+
+def test_trace():
+    with context.lookup_scope(), flywheel.trace() as recorder:
+        assert call(outer_endpoint, 1) == 2
+
+    kinds = {(event.kind, event.args["depth"]) for event in recorder.events}
+    assert {("select", 0), ("harvest", 0), ("call", 0), ("select", 1), ("call", 1)} <= kinds
+
+    # the nested call is charged to its own frame, not to the caller's.
+    stacks = [line.rsplit(" ", 1)[0] for line in recorder.collapsed().splitlines()]
+    assert len(stacks) == 2 and stacks[1].startswith(f"{stacks[0]};")
+
+    exported = recorder.chrome_trace()
+    assert len(exported["traceEvents"]) == len(recorder.events)
+    assert exported["otherData"] == {"dropped": 0}
+
+    # the recorder is detached once the block exits.
+    with context.lookup_scope():
+        call(outer_endpoint, 1)
+
+    assert len(recorder.events) == len(exported["traceEvents"])
+
+
+def test_trace_sample():
+    total = 400
+
+    with context.lookup_scope(), flywheel.trace(sample=0.5) as recorder:
+        for _ in range(total):
+            call(outer_endpoint, 1)
+
+    calls = [event.args["depth"] for event in recorder.events if event.kind == "call"]
+    top = calls.count(0)
+
+    # a sampled dispatch keeps every nested dispatch it made, an unsampled one keeps none.
+    assert 0 < top < total
+    assert calls.count(1) == top
+
+    try:
+        flywheel.trace(sample=0).__enter__()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("sample=0 was accepted")
+
+
+if __name__ == "__main__":
+    test_trace()
+    test_trace_sample()
+    print("ok")